@@ -1,13 +1,87 @@
+import zlib
+from io import BytesIO
 from os import environ
+from time import perf_counter, time
 
-from flask import Flask
+from flask import Flask, request, abort, make_response, g
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.wsgi import get_input_stream
 from apispec import APISpec
 from flask_apispec import FlaskApiSpec
 from flask_jwt_extended import JWTManager
 from apispec.ext.marshmallow import MarshmallowPlugin
 
+try:
+    # optional, pip install brotli
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    # optional, pip install zstandard
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    # optional, pip install orjson
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """parse request bodies and serialize responses with orjson, datetime is
+    encoded natively as ISO 8601 and Decimal, UUID and dataclasses go through
+    the default of the stdlib provider
+    """
+
+    def option(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        # arguments orjson does not know, e.g. separators, keep the stdlib
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+
+        return orjson.dumps(obj, default=self.default, option=self.option()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        return self._app.response_class(
+            orjson.dumps(
+                obj,
+                default=self.default,
+                option=self.option(indent) | orjson.OPT_APPEND_NEWLINE,
+            ),
+            mimetype=self.mimetype,
+        )
+
+
+# orjson when installed, JSON_PROVIDER=stdlib keeps the provider of Flask
+JSON_PROVIDER = environ.get("JSON_PROVIDER", "orjson")
+
 app = Flask(__name__)
 
+if JSON_PROVIDER == "orjson" and orjson is not None:
+    app.json = OrjsonProvider(app)
+
 
 app.config.update(
     {
@@ -28,3 +102,286 @@ app.config.update(
 spec = FlaskApiSpec(app)
 
 jwt = JWTManager(app)
+
+
+@app.teardown_request
+def remove_session(err=None):
+    # drop the identity map and roll back whatever a failed request left open
+    from models.base_model import session
+
+    session.remove()
+
+
+# /metrics/* report SQL shapes, cache keys and pool state, registered on demand
+# and behind authentication
+METRICS = environ.get("METRICS", "false").lower() in ("1", "true")
+
+if METRICS:
+    from utils.helper import authenticate
+
+    @app.get("/metrics/statements")
+    @authenticate
+    def statement_metrics():
+        # imported lazily, models import the app helpers
+        from models.base_model import statement_cache_info
+
+        return statement_cache_info()
+
+    @app.get("/metrics/cache")
+    @authenticate
+    def cache_metrics():
+        from models.base_model import query_cache_info
+
+        return query_cache_info()
+
+    @app.get("/metrics/schemas")
+    @authenticate
+    def schema_metrics():
+        from utils.helper import schema_registry
+
+        return schema_registry.info()
+
+    @app.get("/metrics/pool")
+    @authenticate
+    def pool_metrics():
+        from models.base_model import pool_stats
+
+        return pool_stats()
+
+
+if environ.get("SERVER_TIMING", "false").lower() in ("1", "true"):
+    # registered before the other hooks, the total includes decompression and
+    # compression, streamed lists are timed until their response starts
+    timing_logger = app.logger.getChild("timing")
+    timing_logger.setLevel("INFO")
+
+    @app.before_request
+    def start_timing():
+        from utils.helper import start_timings
+
+        g.__started__ = perf_counter()
+        start_timings()
+
+    @app.after_request
+    def send_timing(response):
+        from utils.helper import stop_timings, server_timing
+
+        timings = stop_timings()
+        if timings is None:
+            return response
+
+        total = perf_counter() - g.__started__
+        response.headers["Server-Timing"] = server_timing(timings, total)
+
+        timing_logger.info(
+            app.json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "duration_ms": round(total * 1000, 2),
+                    **{
+                        f"{name}_ms": round(seconds * 1000, 2)
+                        for name, (seconds, _) in timings.items()
+                    },
+                    **{f"{name}_calls": calls for name, (_, calls) in timings.items()},
+                }
+            )
+        )
+
+        return response
+
+
+def gzip_encoder() -> tuple:
+    encoder = zlib.compressobj(
+        int(environ.get("COMPRESSION_LEVEL", 6)), zlib.DEFLATED, 31
+    )
+
+    return encoder.compress, lambda: encoder.flush(zlib.Z_SYNC_FLUSH), encoder.flush
+
+
+def br_encoder() -> tuple:
+    encoder = brotli.Compressor(quality=4)
+
+    return encoder.process, encoder.flush, encoder.finish
+
+
+def zstd_encoder() -> tuple:
+    encoder = zstandard.ZstdCompressor(level=3).compressobj()
+
+    return (
+        encoder.compress,
+        lambda: encoder.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        encoder.flush,
+    )
+
+
+def gzip_decoder(data: bytes, limit: int) -> bytes:
+    # gzip or zlib header, output stops one byte past the limit
+    return zlib.decompressobj(47).decompress(data, limit + 1)
+
+
+def br_decoder(data: bytes, limit: int) -> bytes:
+    decoder, body = brotli.Decompressor(), b""
+
+    # fed in small slices so a bomb stops close to the limit
+    for start in range(0, len(data), 16384):
+        body += decoder.process(data[start : start + 16384])
+        if len(body) > limit:
+            break
+
+    return body
+
+
+def zstd_decoder(data: bytes, limit: int) -> bytes:
+    reader = zstandard.ZstdDecompressor().stream_reader(BytesIO(data))
+
+    return reader.read(limit + 1)
+
+
+# encoding -> (encoder, decoder) of the installed codecs, in preference order
+CODECS = {
+    "zstd": (zstd_encoder, zstd_decoder) if zstandard is not None else None,
+    "br": (br_encoder, br_decoder) if brotli is not None else None,
+    "gzip": (gzip_encoder, gzip_decoder),
+}
+CODECS = {encoding: codec for encoding, codec in CODECS.items() if codec}
+
+DECODE_ERRORS = (
+    (zlib.error, ValueError)
+    + ((brotli.error,) if brotli is not None else ())
+    + ((zstandard.ZstdError,) if zstandard is not None else ())
+)
+
+# encodings offered to clients in preference order, empty disables compression
+COMPRESSION = [
+    encoding.strip()
+    for encoding in environ.get("COMPRESSION", "zstd,br,gzip").split(",")
+    if encoding.strip() in CODECS
+]
+COMPRESSION_MIN_SIZE = int(environ.get("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_MIMETYPES = environ.get(
+    "COMPRESSION_MIMETYPES",
+    "application/json,application/x-ndjson,text/html,text/css,text/javascript",
+).split(",")
+
+# decompressed size of a request body, stops compression bombs
+REQUEST_MAX_SIZE = int(environ.get("REQUEST_MAX_SIZE", 10 * 1024 * 1024))
+
+
+def compress_stream(chunks, encoder: tuple):
+    """compress a streamed response chunk by chunk, each chunk is flushed so the
+    client receives the rows as soon as they are serialized
+    """
+    compress, flush, finish = encoder
+
+    try:
+        for chunk in chunks:
+            data = compress(chunk.encode() if isinstance(chunk, str) else chunk)
+            yield data + flush()
+
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+@app.before_request
+def decompress_request():
+    # bulk writes can send gzip, br or zstd bodies with Content-Encoding
+    encoding = request.headers.get("Content-Encoding", "identity").strip().lower()
+
+    if encoding == "identity":
+        return
+
+    if encoding not in CODECS:
+        abort(make_response({"message": f"Unsupported encoding {encoding}"}, 415))
+
+    # read before request.stream is cached, it is replaced by the decoded body
+    data = get_input_stream(request.environ, max_content_length=REQUEST_MAX_SIZE)
+
+    try:
+        body = CODECS[encoding][1](data.read(), REQUEST_MAX_SIZE)
+    except DECODE_ERRORS:
+        abort(make_response({"message": f"Invalid {encoding} body"}, 400))
+
+    if len(body) > REQUEST_MAX_SIZE:
+        abort(make_response({"message": f"Body exceeds {REQUEST_MAX_SIZE} bytes"}, 413))
+
+    # the handlers read the decoded body as if it was sent uncompressed
+    request.environ.update(
+        {
+            "wsgi.input": BytesIO(body),
+            "CONTENT_LENGTH": str(len(body)),
+            "HTTP_CONTENT_ENCODING": "identity",
+        }
+    )
+
+
+if COMPRESSION:
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.mimetype not in COMPRESSION_MIMETYPES
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+
+        encoding = request.accept_encodings.best_match(COMPRESSION)
+        if encoding is None or request.method == "HEAD":
+            return response
+
+        encoder = CODECS[encoding][0]()
+
+        # streamed lists are compressed while they are sent
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoder)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < COMPRESSION_MIN_SIZE:
+                return response
+
+            compress, _, finish = encoder
+            response.set_data(compress(data) + finish())
+
+        response.headers["Content-Encoding"] = encoding
+
+        return response
+
+
+if environ.get("DATABASE_REPLICA_URLS"):
+    # a client reads its own writes: GETs stay on the primary while the cookie
+    # set after a write is fresh, replicas may lag behind
+
+    @app.before_request
+    def route_reads():
+        from models.base_model import session
+
+        try:
+            primary = float(request.cookies.get("read_primary_until", 0)) > time()
+        except ValueError:
+            primary = False
+
+        session.info.update(primary=primary, written=False)
+
+    @app.after_request
+    def read_your_writes(response):
+        from models.base_model import session, REPLICA_READ_YOUR_WRITES
+
+        if session.info.pop("written", False):
+            response.set_cookie(
+                "read_primary_until",
+                str(time() + REPLICA_READ_YOUR_WRITES),
+                max_age=REPLICA_READ_YOUR_WRITES,
+                httponly=True,
+            )
+
+        return response
@@ -0,0 +1,42 @@
+from os import environ
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+from runner import app
+from models.base_model import dispose_engines
+
+
+class AsgiInstance(WsgiToAsgiInstance):
+    # requests are not pinned to one thread, the async handlers they await run
+    # concurrently on the event loop, ASGI_THREADS bounds the requests in flight
+    run_wsgi_app = sync_to_async(
+        WsgiToAsgiInstance.__dict__["run_wsgi_app"].func,
+        thread_sensitive=False,
+        executor=ThreadPoolExecutor(int(environ.get("ASGI_THREADS", 64))),
+    )
+
+
+class Asgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+
+        await AsgiInstance(self.wsgi_application)(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+
+            elif message["type"] == "lifespan.shutdown":
+                # the driver threads of pooled connections keep the process alive
+                await dispose_engines()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = Asgi(app)
@@ -0,0 +1,37 @@
+from functools import wraps
+
+from .base_model import BaseModel, session
+
+
+def run_sync(method):
+    """await a BaseModel method on the AsyncSession of the request, its queries
+    await the asyncio driver instead of blocking the event loop
+    param   method      Function    BaseModel method
+    return  wrapper     Function    coroutine function of the method
+    """
+
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        return await session.async_session().run_sync(lambda _: method(*args, **kwargs))
+
+    return wrapper
+
+
+class BaseAsyncModel(BaseModel):
+    __abstract__ = True
+
+    get = run_sync(BaseModel.get)
+    get_all = run_sync(BaseModel.get_all)
+    search = run_sync(BaseModel.search)
+    add = run_sync(BaseModel.add)
+    update = run_sync(BaseModel.update)
+    delete = run_sync(BaseModel.delete)
+    update_where = run_sync(BaseModel.update_where)
+    delete_where = run_sync(BaseModel.delete_where)
+    freshness = run_sync(BaseModel.freshness)
+
+    # serializing may lazy load expired attributes and relationships
+    jsonify = run_sync(BaseModel.jsonify)
+
+    bulk_add = classmethod(run_sync(BaseModel.bulk_add.__func__))
+    bulk_update = classmethod(run_sync(BaseModel.bulk_update.__func__))
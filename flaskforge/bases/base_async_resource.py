@@ -0,0 +1,46 @@
+from flask import current_app, request, g
+from flask_restful import Resource
+
+from models.base_model import session
+from utils.helper import timed
+
+from .base_resource import BaseResource, stream_response
+
+
+@timed("commit")
+async def commit() -> None:
+    """commit the transaction of the request once its handler returns"""
+    await session.async_session.commit()
+
+
+class BaseAsyncResource(BaseResource):
+    def dispatch_request(self, *args, **kwargs):
+        g.__resource__ = self
+
+        # served by asgi.py the coroutine runs on the event loop of the server
+        response = current_app.ensure_sync(self.dispatch_async)(*args, **kwargs)
+
+        # wrapped on the thread sending the response, not on the event loop
+        return stream_response(response)
+
+    async def dispatch_async(self, *args, **kwargs):
+        # writes only flush per operation and commit once, reads never commit
+        write = request.method not in ("GET", "HEAD", "OPTIONS")
+        session.info["managed"] = write
+
+        try:
+            # without representations the handler coroutine is returned as is
+            response = await Resource.dispatch_request(self, *args, **kwargs)
+
+            if write:
+                await commit()
+
+        except Exception:
+            await session.async_session.rollback()
+            raise
+
+        finally:
+            # hand the connection back to the pool before the response is sent
+            await session.async_session.close()
+
+        return response
@@ -0,0 +1,7 @@
+from app import app
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # the async engines are bound to the event loop of the ASGI server
+    uvicorn.run("asgi:application", host="0.0.0.0", port=5000, reload=True)
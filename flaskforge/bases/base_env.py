@@ -13,6 +13,31 @@ JWT_SECRET_KEY = "YOUR_JWT_KEY"
 # Database Configuration
 DATABASE_URL = "sqlite:///storage.db"
 
+# Optional: Specify comma separated read replica URLs serving GET requests
+# (e.g. "sqlite:///replica.db" next to a "sqlite:///storage.db" primary), the
+# seconds between replica health checks and the seconds a client reads from
+# the primary after a write
+DATABASE_REPLICA_URLS = ""
+REPLICA_HEALTH_INTERVAL = 30
+REPLICA_READ_YOUR_WRITES = 5
+
+# Optional: Specify the JSON provider parsing and serializing bodies, orjson
+# (pip install "flaskforge[orjson]", stdlib while it is not installed) or stdlib
+JSON_PROVIDER = "orjson"
+
+# Optional: Specify the response encodings offered in preference order (br and
+# zstd need pip install "flaskforge[compression]", empty disables compression),
+# the smallest body compressed, the gzip level, the compressed mimetypes and the
+# largest request body accepted once decompressed
+COMPRESSION = "zstd,br,gzip"
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_LEVEL = 6
+COMPRESSION_MIMETYPES = "application/json,application/x-ndjson,text/html,text/css,text/javascript"  # fmt: skip
+REQUEST_MAX_SIZE = 10485760
+
+# Optional: Specify the requests served concurrently by asgi.py (initapp --async)
+ASGI_THREADS = 64
+
 # Optional: Specify the SQLAlchemy echo flag to enable SQL logging
 SQLALCHEMY_ECHO = True
 
@@ -20,3 +45,55 @@ SQLALCHEMY_ECHO = True
 SQLALCHEMY_POOL_SIZE = 10
 SQLALCHEMY_MAX_OVERFLOW = 20
 SQLALCHEMY_POOL_TIMEOUT = 30
+
+# Optional: Test connections before use, recycle them after the given seconds
+# (-1 never) and reuse the most recently returned connection first
+SQLALCHEMY_POOL_PRE_PING = True
+SQLALCHEMY_POOL_RECYCLE = 1800
+SQLALCHEMY_POOL_USE_LIFO = False
+
+# Optional: Open a connection per checkout, for PgBouncer in transaction mode
+SQLALCHEMY_NULL_POOL = False
+
+# Optional: Specify how paginated lists count their total records
+# (exact, window, estimate, cached or none) and the cached count lifetime
+PAGINATION_COUNT = "exact"
+PAGINATION_COUNT_TTL = 60
+
+# Optional: Specify the rows fetched and serialized per chunk of the streamed
+# unpaginated lists (page=-1)
+STREAM_CHUNK_SIZE = 500
+
+# Optional: Specify the cache of the resources created with --use-cache: memory
+# (per process), redis (shared, QUERY_CACHE_URL empty uses an in-process
+# stand-in) or none, the seconds results live and the entries kept in memory
+QUERY_CACHE_BACKEND = "memory"
+QUERY_CACHE_URL = ""
+QUERY_CACHE_TTL = 60
+QUERY_CACHE_SIZE = 1024
+
+# Optional: Answer If-None-Match/If-Modified-Since of GET requests with 304 from
+# the latest updated_at and count of the requested rows, one more query per read
+CONDITIONAL_GET = False
+
+# Optional: Specify the schema classes and instances shared between requests
+SCHEMA_REGISTRY_SIZE = 256
+
+# Optional: Dump responses with serializers compiled from the schemas, schemas
+# with custom fields or dump hooks keep marshmallow
+COMPILED_SERIALIZER = False
+
+# Optional: Load request bodies with loaders compiled from the schemas, invalid
+# bodies and schemas with custom load hooks keep marshmallow and its errors
+COMPILED_LOADER = False
+
+# Optional: Time validation, queries, commits, serialization and the database
+# statements of each request, sent as Server-Timing and logged as JSON
+SERVER_TIMING = False
+
+# Optional: Serve the statement, cache, schema and pool counters on /metrics/*
+# to authenticated clients
+METRICS = False
+
+# Optional: Specify the maximum number of records accepted by bulk endpoints
+BULK_MAX_BATCH_SIZE = 1000
@@ -1,13 +1,104 @@
+import json
+from os import environ
+from hashlib import blake2b
 from logging import Logger
+from threading import Lock
+from time import perf_counter
+from contextvars import ContextVar
 from functools import wraps
+from datetime import timezone
+from collections import OrderedDict
+from inspect import iscoroutinefunction
 
 from inflect import engine
-from flask import request, abort
+from flask import request, abort, make_response
 from stringcase import camelcase, snakecase
 from flask_jwt_extended import verify_jwt_in_request
 from marshmallow import fields, Schema, ValidationError
 
 
+# pluralizes the envelope keys, building an engine loads its word lists
+inflector = engine()
+
+# schema classes and instances kept by the registry, least recently used first out
+SCHEMA_REGISTRY_SIZE = int(environ.get("SCHEMA_REGISTRY_SIZE", 256))
+
+
+class SchemaRegistry:
+    """bounded LRU of the schema classes and instances built per request, shared
+    by the threads of the process so the steady state builds none
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: tuple, build):
+        """get the entry of a key, built outside the lock on a miss
+        param   key     Tuple       hashable key of the entry
+        param   build   Function    builds the entry without arguments
+        return  entry   Any         the first entry stored for the key
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                self.stats["hits"] += 1
+                self.entries.move_to_end(key)
+                return entry
+
+            self.stats["misses"] += 1
+
+        entry = build()
+
+        with self.lock:
+            # a concurrent miss may have stored the key first, keep that one
+            entry = self.entries.setdefault(key, entry)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+        return entry
+
+    def info(self) -> dict:
+        with self.lock:
+            return {**self.stats, "size": len(self.entries), "max_size": self.size}
+
+
+schema_registry = SchemaRegistry(SCHEMA_REGISTRY_SIZE)
+
+
+def freeze(value):
+    """turn schema options into a hashable registry key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(v) for v in value)
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+
+    return value
+
+
+def get_schema(schema_cls: type, *args, **kwargs) -> Schema:
+    """get the instance of a schema class shared by every request with the same
+    options, the instances are never mutated after they are built
+    param   schema_cls  type    marshmallow schema class
+    param   args        Tuple   positional options of the schema
+    param   kwargs      Dict    keyword options of the schema, e.g. only, many
+    return  schema      Schema  shared schema instance
+    """
+    return schema_registry.get(
+        ("schema", schema_cls, freeze(args), freeze(kwargs)),
+        lambda: schema_cls(*args, **kwargs),
+    )
+
+
 def get_query_class(schema_cls: type) -> type:
     """
     Generates a new Schema class for query parameters based on the provided Marshmallow schema class.
@@ -58,27 +149,109 @@ def get_query_class(schema_cls: type) -> type:
             **modified_field,
             "page": fields.Int(default=1, allow_none=False),
             "perPage": fields.Int(default=10, allow_none=False),
+            "cursor": fields.Str(allow_none=False),
+            "withCount": fields.Bool(default=True, allow_none=False),
+            "fields": fields.Str(allow_none=False),
         },
     )
 
 
-def create_response_schema(schema_cls: type):
-    p = engine()
-    return type(
-        "ResponseSchema",
-        (Schema,),
+def create_response_schema(
+    schema_cls: type, only: tuple = None, cursor: bool = False
+):
+    """get the envelope schema class of a page, built once per schema and fields
+    param   schema_cls  type    schema class of the items
+    param   only        Tuple   sparse fieldset of the items
+    param   cursor      Bool    keyset page, adds nextCursor and prevCursor
+    return  envelope    type    envelope schema class
+    """
+    cursors = (
         {
-            f"""{
-                p.plural(snakecase(schema_cls.__name__.replace("Schema", "")))
-                }""": fields.Nested(
-                schema_cls, many=True, attribute="items"
-            ),
-            "page": fields.Int(),
-            "perPerage": fields.Int(attribute="per_page"),
-            "totalRecords": fields.Int(attribute="total_records"),
-        },
+            "nextCursor": fields.Str(attribute="next_cursor"),
+            "prevCursor": fields.Str(attribute="prev_cursor"),
+        }
+        if cursor
+        else {}
+    )
+
+    return schema_registry.get(
+        ("envelope", schema_cls, freeze(only), cursor),
+        lambda: type(
+            "ResponseSchema",
+            (Schema,),
+            {
+                f"""{
+                    inflector.plural(
+                        snakecase(schema_cls.__name__.replace("Schema", ""))
+                    )
+                    }""": fields.Nested(
+                    # the fieldset applies to the nested schemas of the items too
+                    schema_cls(only=only, many=True), attribute="items"
+                ),
+                "page": fields.Int(),
+                "perPerage": fields.Int(attribute="per_page"),
+                "totalRecords": fields.Int(attribute="total_records"),
+                **cursors,
+            },
+        ),
+    )
+
+
+# maximum number of records accepted by a bulk request
+BULK_MAX_BATCH_SIZE = int(environ.get("BULK_MAX_BATCH_SIZE", 1000))
+
+# request bodies are loaded by loaders compiled from the schemas
+COMPILED_LOADER = environ.get("COMPILED_LOADER", "false").lower() in ("1", "true")
+
+
+def get_load(schema: Schema):
+    """get the load of a schema instance, compiled with COMPILED_LOADER
+    param   schema  Schema      shared schema instance
+    return  load    Function    load(data) raising the errors of Schema.load
+    """
+    if not COMPILED_LOADER:
+        return schema.load
+
+    # imported lazily, the generator imports the helpers before the schemas
+    from schemas.base_schema import get_loader
+
+    return get_loader(schema)
+
+
+# query string arguments consumed by pagination instead of filtering
+PAGINATION_ARGS = {
+    "page": int,
+    "perPage": int,
+    "cursor": str,
+    "withCount": lambda v: v.lower() not in ("false", "0", "no"),
+    "fields": str,
+}
+
+
+def get_fields(schema_cls: type, value: str) -> tuple:
+    """parse a sparse fieldset into snakecase dotted paths of the schema
+    param   schema_cls  type    schema class dumping the resource
+    param   value       String  comma separated fields, e.g. "title,posts.title"
+    return  paths       Tuple   validated field paths
+    """
+    paths = tuple(
+        ".".join(snakecase(name) for name in path.strip().split("."))
+        for path in value.split(",")
+        if path.strip()
     )
 
+    for path in paths:
+        fields_ = get_schema(schema_cls).fields
+
+        for name in path.split("."):
+            field = fields_.get(name)
+            if field is None:
+                abort(400, f"Unknown field {path}")
+
+            fields_ = field.schema.fields if isinstance(field, fields.Nested) else {}
+
+    return paths
+
 
 def logger(name="IAM", filename="errors.log"):
     """instantiate new log class
@@ -89,21 +262,290 @@ def logger(name="IAM", filename="errors.log"):
     return Logger(name).get_logger(filename)
 
 
-def validator(Schema, *ma_args, **ma_kwargs):
+def get_expression(schema_cls: type) -> dict:
+    """load the query string filters of a bulk write
+    param   schema_cls  type    schema class of the resource
+    return  expression  Dict    filters in the get_query format
+    """
+    schema = get_schema(schema_cls, partial=True, context={"query": True})
+
+    try:
+        return schema.load(request.args.to_dict())
+    except ValidationError as err:
+        abort(make_response({"message": "Invalid filter", "errors": err.messages}, 400))
+
+
+# per request timings sent as Server-Timing and logged, false leaves the
+# handlers and the engine untouched
+SERVER_TIMING = environ.get("SERVER_TIMING", "false").lower() in ("1", "true")
+
+# timings of the current request, None outside requests and when disabled
+_timings = ContextVar("timings", default=None)
+
+
+def start_timings() -> None:
+    """start recording the timings of the current request"""
+    _timings.set({})
+
+
+def stop_timings() -> dict:
+    """stop recording the timings of the current request
+    return  timings Dict    name -> [seconds, calls], None when not recording
+    """
+    timings = _timings.get()
+    _timings.set(None)
+
+    return timings
+
+
+def record(name: str, seconds: float) -> None:
+    """add a duration to the timings of the current request
+    param   name    String  metric name
+    param   seconds Float   duration
+    """
+    timings = _timings.get()
+
+    if timings is not None:
+        metric = timings.setdefault(name, [0.0, 0])
+        metric[0] += seconds
+        metric[1] += 1
+
+
+class timer:
+    """context manager recording its duration under a metric name"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record(self.name, perf_counter() - self.started)
+
+
+def timed(name: str):
+    """record the duration of each call of the function, the function is
+    returned as is when SERVER_TIMING is disabled
+    param   name        String      metric name
+    return  decorator   Function
+    """
 
     def decorator(func):
+        if not SERVER_TIMING:
+            return func
+
+        if iscoroutinefunction(func):
 
-        data = request.json if func.__name__ != "get" else request.args.to_dict()
+            @wraps(func)
+            async def async_inner(*args, **kwargs):
+                with timer(name):
+                    return await func(*args, **kwargs)
 
-        schema = Schema(*ma_args, **ma_kwargs)
+            return async_inner
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+def server_timing(timings: dict, total: float) -> str:
+    """format timings as a Server-Timing header
+    param   timings Dict    name -> [seconds, calls]
+    param   total   Float   seconds spent in the request
+    return  header  String  e.g. validate;dur=0.41;desc="1 calls", total;dur=3.20
+    """
+    metrics = [
+        f'{name};dur={seconds * 1000:.2f};desc="{calls} calls"'
+        for name, (seconds, calls) in timings.items()
+    ]
+
+    return ", ".join(metrics + [f"total;dur={total * 1000:.2f}"])
+
+
+# GET handlers answer If-None-Match/If-Modified-Since, true runs a freshness
+# query before the reads counting their rows exactly
+CONDITIONAL_GET = environ.get("CONDITIONAL_GET", "false").lower() in ("1", "true")
+
+
+def get_validators(freshness: tuple, expression: dict, pagination: dict) -> tuple:
+    """derive the ETag and Last-Modified of a read from its freshness
+    param   freshness   Tuple       (max updated_at, count, max updated_at and
+                                    count of the related tables)
+    param   expression  Dict        filters of the read
+    param   pagination  Dict        pagination and sparse fieldset of the read
+    return  validators  Tuple       (etag, last_modified), last_modified is None
+                                    without rows
+    """
+    last_modified, total, related = freshness
+
+    etag = blake2b(
+        json.dumps(
+            [str(last_modified), total, related, expression, pagination],
+            sort_keys=True,
+            default=str,
+        ).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+    # updated_at is stored in UTC with second precision in HTTP dates
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+
+    return etag, last_modified
+
+
+def is_not_modified(etag: str, last_modified) -> bool:
+    """check the conditional headers of the request, If-None-Match first
+    param   etag            String      current ETag of the read
+    param   last_modified   datetime    current Last-Modified of the read
+    return  not_modified    Bool        the client copy is fresh
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+
+    return False
+
+
+def conditional(model_cls: type, search: bool = False, single: bool = False):
+    """answer conditional GETs with 304 from max(updated_at) and the count of
+    the filtered rows before the page query and serialization run, apply it
+    before validator so it receives the loaded filters. Reads served by the
+    query cache or not counting their rows exactly skip the freshness query,
+    their ETag is the one of the response body
+    param   model_cls   type    model class of the resource
+    param   search      Bool    the handler searches instead of filtering
+    param   single      Bool    the handler reads one record instead of a list
+    return  decorator   Function
+    """
+
+    def decorator(func):
+        if not CONDITIONAL_GET:
+            return func
+
+        def is_checked(pagination):
+            if model_cls.__cache__:
+                return False
+
+            return single or (
+                model_cls.__count__ == "exact" and pagination.get("with_count", True)
+            )
+
+        def respond_from_body(response):
+            # streamed lists are sent as they are serialized, they have no ETag
+            if response.status_code == 200 and not response.is_streamed:
+                response.add_etag(weak=True)
+                response.make_conditional(request)
+
+            return response
+
+        def get_list_validators(freshness, expression, pagination):
+            etag, last_modified = get_validators(freshness, expression, pagination)
+
+            # deleting any row but the newest one leaves max(updated_at) as is,
+            # only the ETag, which counts the rows, validates a list
+            return etag, last_modified if single else None
+
+        def respond(response, etag, last_modified):
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+
+            return response
+
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_inner(expression, pagination, *args, **kwargs):
+                if not is_checked(pagination):
+                    return respond_from_body(
+                        await func(expression, pagination, *args, **kwargs)
+                    )
+
+                etag, last_modified = get_list_validators(
+                    await model_cls().freshness(expression, search),
+                    expression,
+                    pagination,
+                )
+
+                if is_not_modified(etag, last_modified):
+                    return respond(make_response("", 304), etag, last_modified)
+
+                return respond(
+                    await func(expression, pagination, *args, **kwargs),
+                    etag,
+                    last_modified,
+                )
+
+            return async_inner
+
+        @wraps(func)
+        def inner(expression, pagination, *args, **kwargs):
+            if not is_checked(pagination):
+                return respond_from_body(func(expression, pagination, *args, **kwargs))
+
+            etag, last_modified = get_list_validators(
+                model_cls().freshness(expression, search), expression, pagination
+            )
+
+            if is_not_modified(etag, last_modified):
+                return respond(make_response("", 304), etag, last_modified)
+
+            return respond(
+                func(expression, pagination, *args, **kwargs), etag, last_modified
+            )
+
+        return inner
+
+    return decorator
+
+
+def validator(Schema, *ma_args, bulk=False, **ma_kwargs):
+
+    def decorator(func):
+
+        # bulk writes can target every row matching the query string
+        expression = (
+            get_expression(Schema)
+            if bulk and func.__name__ in ("put", "patch", "delete")
+            else None
+        )
+
+        # a filtered delete has nothing to load from the body
+        filtered_delete = bool(expression) and func.__name__ == "delete"
+
+        data = (
+            {}
+            if filtered_delete
+            else request.json if func.__name__ != "get" else request.args.to_dict()
+        )
+
+        # bulk endpoints accept a JSON array validated item by item
+        many = bulk and isinstance(data, list)
+        if many and len(data) > BULK_MAX_BATCH_SIZE:
+            abort(413, f"Batch exceeds {BULK_MAX_BATCH_SIZE} records")
+
+        schema = get_schema(Schema, *ma_args, many=many, **ma_kwargs)
 
         try:
 
-            data_dict = schema.load(data)
+            data_dict = (
+                {} if filtered_delete else timed("validate")(get_load(schema))(data)
+            )
 
         except ValidationError as err:
             print(err)
-            abort(400)
+            abort(make_response({"message": "Invalid data", "errors": err.messages}, 400))
 
         except Exception:
             abort(500)
@@ -116,20 +558,45 @@ def validator(Schema, *ma_args, **ma_kwargs):
                     3) ....
             """
 
+        # bulk updates match records by id
+        if many and func.__name__ in ("put", "patch"):
+            errors = {
+                i: {"id": ["Missing data for required field."]}
+                for i, record in enumerate(data_dict)
+                if record.get("id") is None
+            }
+            if errors:
+                abort(make_response({"message": "Invalid data", "errors": errors}, 400))
+
         @wraps(func)
         def inner(*args, **kwargs):
             pagination = {
-                snakecase(k): int(v)
+                snakecase(k): PAGINATION_ARGS[k](v)
                 for k, v in request.args.to_dict().items()
-                if k in ["page", "perPage"]
+                if k in PAGINATION_ARGS
             }
 
+            if pagination.get("fields"):
+                pagination["fields"] = get_fields(Schema, pagination["fields"])
+
+            if request.method == "GET":
+                return func(data_dict, pagination, *args, **kwargs)
+
             return (
                 func(data_dict, *args, **kwargs)
-                if request.method != "GET"
-                else func(data_dict, pagination, *args, **kwargs)
+                if expression is None
+                else func(data_dict, expression, *args, **kwargs)
             )
 
+        # async handlers stay coroutine functions for the decorators after this one
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_inner(*args, **kwargs):
+                return await inner(*args, **kwargs)
+
+            return async_inner
+
         return inner
 
     return decorator
@@ -137,6 +604,15 @@ def validator(Schema, *ma_args, **ma_kwargs):
 
 def authenticate(*auth_args, **auth_kwargs):
     def decorator(fn):
+        if iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                verify_jwt_in_request()
+                return await fn(*args, **kwargs)
+
+            return async_wrapper
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
@@ -1,9 +1,42 @@
+import json
+import asyncio
 from os import environ
 from math import ceil
+from itertools import count, islice
+from time import monotonic, perf_counter
+from hashlib import blake2b
+from functools import cached_property
+from contextlib import contextmanager
+from threading import Lock, RLock, get_ident
+from collections import OrderedDict
+from datetime import date, datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 
-from stringcase import snakecase
+from flask import Response, abort, current_app, has_request_context, request
+from flask import make_response
+from stringcase import camelcase, snakecase
+from marshmallow import fields
+from sqlalchemy import orm, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, DateTime, func, create_engine
+from sqlalchemy import (
+    Column,
+    Integer,
+    DateTime,
+    func,
+    text,
+    create_engine,
+    tuple_,
+    literal,
+    insert,
+    update,
+    bindparam,
+    table,
+    column,
+    literal_column,
+    String,
+    type_coerce,
+    select,
+)
 from sqlalchemy.orm import (
     Query,
     class_mapper,
@@ -11,58 +44,1067 @@ from sqlalchemy.orm import (
     scoped_session,
     RelationshipProperty,
     ColumnProperty,
+    ONETOMANY,
+)
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    async_sessionmaker,
+    async_scoped_session,
 )
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from utils.helper import create_response_schema, get_schema
+from utils.helper import SERVER_TIMING, record, timed
+
+# engines run on the asyncio drivers, set by flaskforge initapp --async
+USE_ASYNC = False
 
-from utils.helper import create_response_schema
+# asyncio drivers replacing the default drivers of the database urls
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
 
 
 class Paginate:
-    def __init__(self, page, per_page, total, items) -> None:
+    def __init__(
+        self, page, per_page, total, items, next_cursor=None, prev_cursor=None
+    ) -> None:
         self.page = page
         self.per_page = per_page
         self.total_records = total
-        self.total_pages = ceil(total / per_page)
+        self.total_pages = ceil(total / per_page) if total is not None else None
         self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+class Stream:
+    """unpaginated rows of a query, fetched and serialized chunk by chunk while
+    the response is sent instead of loaded at once, see BaseModel.stream
+    """
+
+    def __init__(self, query, replica=None) -> None:
+        self.query = query
+        self.replica = replica
+
+
+def encode_cursor(values: list, direction: str = "next") -> str:
+    """encode sort key values into an opaque cursor
+    param   values      List        sort key values of the boundary row
+    param   direction   String      next or prev
+    return  cursor      String      url-safe cursor
+    """
+    payload = json.dumps(
+        {
+            "v": [v.isoformat() if isinstance(v, date) else v for v in values],
+            "d": direction,
+        },
+        separators=(",", ":"),
+    )
+
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> tuple:
+    """decode an opaque cursor back into typed sort key values
+    param   cursor      String      cursor returned by encode_cursor
+    param   columns     List        sort key columns
+    return  cursor      Tuple       (values, direction)
+    """
+    try:
+        payload = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+        if len(payload["v"]) != len(columns):
+            raise ValueError
+
+        values = [
+            (
+                c.type.python_type.fromisoformat(v)
+                if v is not None and c.type.python_type in (date, datetime)
+                else v
+            )
+            for c, v in zip(columns, payload["v"])
+        ]
+    except (ValueError, KeyError, TypeError) as err:
+        raise ValueError(f"Invalid cursor {cursor}") from err
+
+    return values, "prev" if payload.get("d") == "prev" else "next"
+
+
+# exact: COUNT(*), window: COUNT(*) OVER() on the page query, estimate: planner
+# row estimate, cached: exact count memoized per filter for PAGINATION_COUNT_TTL
+COUNT_STRATEGIES = ("exact", "window", "estimate", "cached", "none")
+
+COUNT_CACHE_TTL = float(environ.get("PAGINATION_COUNT_TTL", 60))
+COUNT_CACHE_SIZE = int(environ.get("PAGINATION_COUNT_CACHE_SIZE", 1024))
+
+_count_cache = OrderedDict()
+_count_cache_lock = Lock()
+
+# loader strategies a relationship can pin with info={"loader": ...}
+LOADERS = {
+    "selectin": "selectinload",
+    "joined": "joinedload",
+    "subquery": "subqueryload",
+    "lazy": "lazyload",
+    "raise": "raiseload",
+}
+
+_loader_cache = {}
+
+# get_query statements cached by filter shape, only bound parameters change
+STATEMENT_CACHE_SIZE = int(environ.get("STATEMENT_CACHE_SIZE", 512))
+
+_statement_cache = OrderedDict()
+_statement_cache_lock = Lock()
+_statement_cache_stats = {"hits": 0, "misses": 0}
+
+
+def statement_cache_info() -> dict:
+    """get the counters of the get_query statement cache
+    return  info        Dict        hits, misses, size and maxsize
+    """
+    with _statement_cache_lock:
+        return {
+            **_statement_cache_stats,
+            "size": len(_statement_cache),
+            "maxsize": STATEMENT_CACHE_SIZE,
+        }
+
+
+# serialized results of get, get_all and search of the models with __cache__,
+# memory: LRU of the process, redis: shared by every worker, none: disabled
+QUERY_CACHE_BACKEND = environ.get("QUERY_CACHE_BACKEND", "memory")
+QUERY_CACHE_URL = environ.get("QUERY_CACHE_URL", "")
+QUERY_CACHE_TTL = int(environ.get("QUERY_CACHE_TTL", 60))
+QUERY_CACHE_SIZE = int(environ.get("QUERY_CACHE_SIZE", 1024))
+
+# rows fetched and serialized per chunk of the streamed unpaginated lists
+STREAM_CHUNK_SIZE = int(environ.get("STREAM_CHUNK_SIZE", 500))
+
+NDJSON = "application/x-ndjson"
+
+# ids deleted per statement by filtered deletes of rows with dependents
+DELETE_CHUNK_SIZE = 1000
+
+# jsonify dumps with serializers compiled from the schemas instead of marshmallow
+COMPILED_SERIALIZER = environ.get("COMPILED_SERIALIZER", "false").lower() in (
+    "1",
+    "true",
+)
+
+_query_cache_lock = Lock()
+_query_cache_stats = {"hits": 0, "misses": 0}
+
+
+class MemoryCache:
+    """LRU of serialized results expiring after their ttl, the table versions
+    are kept apart so evicting results never resets a version
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.entries = OrderedDict()
+        self.tables = {}
+        self.lock = Lock()
+
+    def get(self, key: str):
+        with self.lock:
+            hit = self.entries.get(key)
+
+            if hit is None:
+                return None
+
+            if hit[0] <= monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+
+        return hit[1]
+
+    def set(self, key: str, value, ttl: int) -> None:
+        with self.lock:
+            self.entries[key] = (monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def versions(self, tables: tuple) -> list:
+        return [self.tables.get(table, 0) for table in tables]
+
+    def bump(self, tables) -> None:
+        with self.lock:
+            for table in tables:
+                self.tables[table] = self.tables.get(table, 0) + 1
+
+
+class RedisCache:
+    """serialized results shared by every worker through Redis, the table
+    versions are counters incremented on commit, unreachable Redis is a miss
+    """
+
+    def __init__(self, client, errors: tuple = ()) -> None:
+        self.client = client
+        self.errors = errors
+
+    def get(self, key: str):
+        try:
+            value = self.client.get(f"query:{key}")
+        except self.errors:
+            return None
+
+        return None if value is None else json.loads(value)
+
+    def set(self, key: str, value, ttl: int) -> None:
+        try:
+            self.client.set(f"query:{key}", json.dumps(value), ex=ttl)
+        except self.errors:
+            ...
+
+    def versions(self, tables: tuple) -> list:
+        try:
+            values = self.client.mget([f"version:{table}" for table in tables])
+        except self.errors:
+            return None
+
+        return [int(value or 0) for value in values]
+
+    def bump(self, tables) -> None:
+        for table in tables:
+            self.client.incr(f"version:{table}")
+
+
+class LocalRedis:
+    """in-process stand-in of the Redis commands used by RedisCache, used when
+    QUERY_CACHE_URL is empty, expired keys are dropped when read
+    """
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.lock = RLock()
+
+    def get(self, key: str):
+        with self.lock:
+            hit = self.data.get(key)
+
+            if hit is not None and hit[0] is not None and hit[0] <= monotonic():
+                del self.data[key]
+                hit = None
+
+        return None if hit is None else hit[1]
+
+    def set(self, key: str, value, ex: int = None) -> None:
+        with self.lock:
+            self.data[key] = (
+                monotonic() + ex if ex else None,
+                value.encode() if isinstance(value, str) else value,
+            )
+
+    def mget(self, keys: list) -> list:
+        return [self.get(key) for key in keys]
+
+    def incr(self, key: str) -> int:
+        with self.lock:
+            value = int(self.get(key) or 0) + 1
+            self.set(key, str(value))
+
+        return value
+
+
+def create_query_cache(backend: str, url: str):
+    """create the backend of the query result cache
+    param   backend     String      memory, redis or none
+    param   url         String      redis url, empty for the in-process stand-in
+    return  cache       Object      MemoryCache or RedisCache, None when disabled
+    """
+    if backend == "none":
+        return None
+
+    if backend == "memory":
+        return MemoryCache(QUERY_CACHE_SIZE)
+
+    if backend != "redis":
+        raise ValueError(f"Unknown query cache backend {backend}")
+
+    if not url:
+        return RedisCache(LocalRedis())
+
+    # optional dependency, pip install redis
+    import redis
+
+    return RedisCache(redis.Redis.from_url(url), (redis.RedisError,))
+
+
+query_cache = create_query_cache(QUERY_CACHE_BACKEND, QUERY_CACHE_URL)
+
+
+def query_cache_info() -> dict:
+    """get the counters of the query result cache
+    return  info        Dict        hits, misses and backend
+    """
+    with _query_cache_lock:
+        return {**_query_cache_stats, "backend": QUERY_CACHE_BACKEND}
+
+
+def get_loader_options(mapper, schema, parent=None, seen=()) -> list:
+    """derive eager loader options from the nested fields of a schema
+    param   mapper      Mapper      mapper of the serialized model
+    param   schema      Schema      schema instance dumping the model
+    param   parent      Load        loader option of the parent relationship
+    param   seen        Tuple       mappers already on the path, stops cycles
+    return  options     List        loader options for Query.options
+    """
+    options = []
+
+    for name, field in schema.fields.items():
+        if not isinstance(field, fields.Nested):
+            continue
+
+        relationship = mapper.relationships.get(field.attribute or name)
+        if relationship is None or relationship.mapper in seen:
+            continue
+
+        # collections are loaded with one IN query, scalars with a LEFT JOIN
+        strategy = relationship.info.get(
+            "loader", "selectin" if relationship.uselist else "joined"
+        )
+        loader = getattr(parent if parent is not None else orm, LOADERS[strategy])
+        option = loader(relationship.class_attribute)
+
+        options.append(option)
+        options.extend(
+            get_loader_options(
+                relationship.mapper,
+                field.schema,
+                option,
+                seen + (mapper,),
+            )
+        )
+
+    return options
+
+
+def get_fieldset_options(mapper, schema, paths, parent=None) -> list:
+    """derive load_only and loader options from a sparse fieldset
+    param   mapper      Mapper      mapper of the serialized model
+    param   schema      Schema      schema instance dumping the model
+    param   paths       Tuple       dotted field paths relative to the mapper
+    param   parent      Load        loader option of the parent relationship
+    return  options     List        loader options for Query.options
+    """
+    names = {path.split(".")[0] for path in paths}
+
+    # keys are always loaded so identity and relationships still resolve
+    columns = [
+        attr.class_attribute
+        for attr in mapper.column_attrs
+        if attr.key in names
+        or attr.columns[0].primary_key
+        or attr.columns[0].foreign_keys
+    ]
+    options = [(parent if parent is not None else orm).load_only(*columns)]
+
+    for name, relationship in mapper.relationships.items():
+        field = schema.fields.get(name)
+        if name not in names or not isinstance(field, fields.Nested):
+            continue
+
+        strategy = relationship.info.get(
+            "loader", "selectin" if relationship.uselist else "joined"
+        )
+        loader = getattr(parent if parent is not None else orm, LOADERS[strategy])
+        option = loader(relationship.class_attribute)
+
+        if name in paths:
+            options.append(option)
+            options.extend(
+                get_loader_options(relationship.mapper, field.schema, option, (mapper,))
+            )
+            continue
+
+        options.extend(
+            get_fieldset_options(
+                relationship.mapper,
+                field.schema,
+                tuple(
+                    path.split(".", 1)[1]
+                    for path in paths
+                    if path.startswith(f"{name}.")
+                ),
+                option,
+            )
+        )
+
+    return options
 
 
 class BaseQuery(Query):
-    def paginate(self, page=None, per_page=None, count=True):
+    def exact_count(self):
+        """get exact count with a separate COUNT(*) query
+        param   self        BaseQuery   BaseQuery class
+        return  total       Int         number of rows
+        """
+        return self.order_by(None).count()
+
+    def estimate_count(self):
+        """get the planner row estimate instead of counting
+        param   self        BaseQuery   BaseQuery class
+        return  total       Int         estimated number of rows
+        """
+        q = self.order_by(None).enable_eagerloads(False)
+        dialect = self.session.get_bind().dialect
+
+        try:
+            if dialect.name == "postgresql":
+                compiled = q.statement.compile(dialect=dialect)
+                plan = (
+                    self.session.connection()
+                    .exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                    )
+                    .scalar()
+                )
+                return int(plan[0]["Plan"]["Plan Rows"])
+
+            # sqlite_stat1 only knows table sizes, so it cannot estimate filters
+            if dialect.name == "sqlite" and q.whereclause is None:
+                stat = self.session.execute(
+                    text(
+                        "SELECT stat FROM sqlite_stat1 WHERE tbl = :tbl "
+                        "ORDER BY idx IS NOT NULL LIMIT 1"
+                    ),
+                    {"tbl": self.column_descriptions[0]["entity"].__tablename__},
+                ).scalar()
+                if stat:
+                    return int(stat.split(" ")[0])
+        except OperationalError:
+            # ANALYZE has never run, sqlite_stat1 does not exist yet
+            ...
+
+        return q.count()
+
+    def cached_count(self):
+        """get exact count memoized per filter expression
+        param   self        BaseQuery   BaseQuery class
+        return  total       Int         number of rows
+        """
+        q = self.order_by(None).enable_eagerloads(False)
+        compiled = q.statement.compile()
+        key = (
+            str(compiled),
+            tuple(sorted((k, repr(v)) for k, v in compiled.params.items())),
+        )
+
+        with _count_cache_lock:
+            hit = _count_cache.get(key)
+
+        if hit is not None and hit[0] > monotonic():
+            return hit[1]
+
+        total = q.count()
+
+        with _count_cache_lock:
+            _count_cache[key] = (monotonic() + COUNT_CACHE_TTL, total)
+            _count_cache.move_to_end(key)
+            while len(_count_cache) > COUNT_CACHE_SIZE:
+                _count_cache.popitem(last=False)
+
+        return total
+
+    def total(self, count="exact"):
+        """get total records with the given count strategy
+        param   self        BaseQuery   BaseQuery class
+        param   count       String      one of COUNT_STRATEGIES, True or False
+        return  total       Int         total records, None when not counted
+        """
+        count = {True: "exact", False: "none"}.get(count, count)
+
+        if count not in COUNT_STRATEGIES:
+            raise ValueError(f"Unknown count strategy {count}")
+
+        return {
+            "exact": self.exact_count,
+            "window": self.exact_count,
+            "estimate": self.estimate_count,
+            "cached": self.cached_count,
+            "none": lambda: None,
+        }[count]()
+
+    def windowed(self):
+        """get items and total records in a single round trip
+        param   self        BaseQuery   BaseQuery class
+        return  items       Tuple       (items, total), total is None without rows
+        """
+        rows = self.add_columns(func.count().over()).all()
+
+        return [row[0] for row in rows], rows[0][-1] if rows else None
+
+    def seek(self, per_page=None, cursor=None, sort_key="id", count=True):
+        """get keyset paginate
+        param   self        BaseQuery   BaseQuery class
+        param   per_page    Int         per page
+        param   cursor      String      cursor returned by previous page
+        param   sort_key    String      indexed column to seek on
+        param   count       String      count strategy, see COUNT_STRATEGIES
+        return  items       Paginate    Paginate with next and prev cursor
+        """
+
+        per_page = per_page if per_page else 10
+
+        entity = self.column_descriptions[0]["entity"]
+
+        # id is always appended as tie-breaker so the sort key is unique
+        keys = list(dict.fromkeys((sort_key, "id")))
+        columns = [getattr(entity, key).expression for key in keys]
+
+        # SQLite keeps dates as text in the format they were written in, the
+        # CURRENT_TIMESTAMP of func.now() has no microseconds while bound
+        # datetimes have them, seek on the stored text instead
+        if self.session.get_bind().dialect.name == "sqlite":
+            columns = [
+                (
+                    type_coerce(c, String)
+                    if get_python_type(c) in (date, datetime)
+                    else c
+                )
+                for c in columns
+            ]
+
+        try:
+            values, direction = (
+                decode_cursor(cursor, columns) if cursor else (None, "next")
+            )
+        except ValueError as err:
+            # a malformed or tampered cursor is a client error
+            abort(400, str(err))
+
+        q = self.order_by(None)
+
+        if values is not None:
+            # bind with the column types so dates compare as stored
+            bound = tuple_(*(literal(v, c.type) for c, v in zip(columns, values)))
+            q = q.filter(
+                tuple_(*columns) > bound
+                if direction == "next"
+                else tuple_(*columns) < bound
+            )
+
+        q = q.order_by(*(c.asc() if direction == "next" else c.desc() for c in columns))
+
+        # fetch one extra row to know whether there is a page behind this one,
+        # with the sort key values as they compare in the database
+        rows = q.add_columns(*columns).limit(per_page + 1).all()
+
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+
+        if direction == "prev":
+            rows.reverse()
+
+        has_next = has_more if direction == "next" else values is not None
+        has_prev = has_more if direction == "prev" else values is not None
+
+        next_cursor = encode_cursor(list(rows[-1][1:])) if rows and has_next else None
+        prev_cursor = (
+            encode_cursor(list(rows[0][1:]), "prev") if rows and has_prev else None
+        )
+        items = [row[0] for row in rows]
+
+        # the window count would only see rows behind the cursor
+        total = self.total(count)
+
+        return Paginate(None, per_page, total, items, next_cursor, prev_cursor)
+
+    @timed("paginate")
+    def paginate(
+        self,
+        page=None,
+        per_page=None,
+        count=True,
+        cursor=None,
+        sort_key=None,
+        with_count=True,
+    ):
         """get paginate
         param   self        BaseQuery   BaseQuery class
         param   page        Int         page
         param   per_page    Int         per page
-        param   count       Int         count
-        return  items       List        Lits of pagiaate
+        param   count       String      count strategy, see COUNT_STRATEGIES
+        param   cursor      String      cursor, only used with sort_key
+        param   sort_key    String      seek on sort_key instead of LIMIT/OFFSET
+        param   with_count  Bool        False when the client skips the total
+        return  items       Paginate    page of items, Stream when page < 0
         """
 
+        count = count if with_count else "none"
+
+        if sort_key is not None and (page is None or page > 0):
+            return self.seek(per_page, cursor, sort_key, count)
+
         page = page if page else 1
 
+        # unpaginated lists run while the response is sent, jsonify streams them
+        if page < 0:
+            return Stream(self, self.session.info.get("replica"))
+
         per_page = per_page if per_page else 10
 
-        items = (
-            self.limit(per_page).offset((page - 1) * per_page).all()
-            if page > 0
-            else self.all()
+        if page > 0 and count == "window":
+            items, total = self.limit(per_page).offset((page - 1) * per_page).windowed()
+
+            # an empty page does not tell the total, count it instead
+            total = total if total is not None else self.total("exact")
+
+            return Paginate(page, per_page, total, items)
+
+        items = self.limit(per_page).offset((page - 1) * per_page).all()
+
+        return Paginate(page, per_page, self.total(count), items)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.waits = {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "timeouts": 0}
+
+    def _do_get(self):
+        started = monotonic()
+
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.waits["timeouts"] += 1
+            raise
+        finally:
+            waited = monotonic() - started
+            self.waits["count"] += 1
+            self.waits["seconds"] += waited
+            self.waits["max_seconds"] = max(self.waits["max_seconds"], waited)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.waits = self.waits
+        return pool
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """TimedQueuePool of the asyncio engines"""
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """read a boolean environment variable
+    param   name        String      variable name
+    param   default     Bool        value when the variable is not set
+    return  flag        Bool        true for 1, true, yes and on
+    """
+    value = environ.get(name)
+
+    return default if value is None else value.lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(url: str) -> dict:
+    """read the pool configuration of create_engine from the environment
+    param   url         String      database url
+    return  options     Dict        keyword arguments of create_engine
+    """
+    options = {
+        "pool_pre_ping": env_flag("SQLALCHEMY_POOL_PRE_PING"),
+        "pool_recycle": int(environ.get("SQLALCHEMY_POOL_RECYCLE", -1)),
+    }
+
+    # PgBouncer pools the connections itself, keep none open in the app
+    if env_flag("SQLALCHEMY_NULL_POOL"):
+        return {**options, "poolclass": NullPool}
+
+    # in-memory SQLite lives in its connection, keep the default pool
+    if url.startswith("sqlite") and (
+        url in ("sqlite://", "sqlite:///") or ":memory:" in url
+    ):
+        return options
+
+    return {
+        **options,
+        "poolclass": TimedQueuePool,
+        "pool_size": int(environ.get("SQLALCHEMY_POOL_SIZE", 10)),
+        "max_overflow": int(environ.get("SQLALCHEMY_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(environ.get("SQLALCHEMY_POOL_TIMEOUT", 30)),
+        "pool_use_lifo": env_flag("SQLALCHEMY_POOL_USE_LIFO"),
+    }
+
+
+def build_engine(url: str):
+    """create an engine with the pool configured from the environment
+    param   url         String      database url
+    return  engine      Engine      engine
+    """
+    if USE_ASYNC:
+        return build_async_engine(url)
+
+    return create_engine(url, **engine_options(url))
+
+
+def build_async_engine(url: str):
+    """create an asyncio engine with the pool configured from the environment
+    param   url         String      database url, its default driver is swapped
+    return  engine      Engine      sync facade of the AsyncEngine used by the ORM
+    """
+    url = make_url(url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+    options = engine_options(str(url))
+    if options.get("poolclass") is TimedQueuePool:
+        options["poolclass"] = TimedAsyncQueuePool
+
+    return create_async_engine(url, **options).sync_engine
+
+
+def get_pool_stats(engine_) -> dict:
+    """get the live counters of the pool of an engine
+    param   engine_     Engine      engine
+    return  stats       Dict        pool size, checked in/out, overflow and waits
+    """
+    pool = engine_.pool
+    stats = {"pool": pool.__class__.__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
         )
 
-        total = self.order_by(None).count() if count else None
+    if isinstance(pool, TimedQueuePool):
+        stats.update({f"wait_{k}": v for k, v in pool.waits.items()})
+
+    return stats
 
-        return Paginate(page, per_page, total, items) if page != -1 else items
 
+def pool_stats() -> dict:
+    """get the pool counters of the primary and replica engines
+    return  stats       Dict        primary and replicas pool stats
+    """
+    return {
+        "primary": get_pool_stats(engine),
+        "replicas": [get_pool_stats(e) for e in replicas.engines],
+    }
 
-engine = create_engine(
+
+engine = build_engine(
     "postgresql://{db_username}:{db_pwd}@db/{db_name}".format(
         db_username=environ.get("POSTGRES_USER"),
         db_pwd=environ.get("POSTGRES_PASSWORD"),
         db_name=environ.get("POSTGRES_DB"),
-        pool_size=environ.get("SQLALCHEMY_POOL_SIZE", 10),
-        max_overflow=environ.get("SQLALCHEMY_MAX_OVERFLOW", 10),
-        pool_timeout=environ.get("SQLALCHEMY_POOL_TIMEOUT", 30),
     )
 )
 
-session = scoped_session(sessionmaker(bind=engine, query_cls=BaseQuery))
+
+class ReplicaPool:
+    """round-robin over the read replica engines, a replica failing its health
+    check or a query is skipped until it answers the next check
+    """
+
+    def __init__(self, urls: list, interval: float) -> None:
+        self.engines = [build_engine(url) for url in urls]
+        self.interval = interval
+        self.healthy = [True] * len(self.engines)
+        self.checked = [monotonic()] * len(self.engines)
+        self.counter = count()
+
+        for engine_ in self.engines:
+            event.listen(engine_, "handle_error", self.on_error)
+
+    def ping(self, index: int) -> bool:
+        """check a replica answers SELECT 1
+        param   index       Integer     position of the replica
+        return  healthy     Bool        replica is usable
+        """
+        try:
+            with self.engines[index].connect() as connection:
+                connection.execute(text("SELECT 1"))
+            self.healthy[index] = True
+        except SQLAlchemyError:
+            self.healthy[index] = False
+
+        self.checked[index] = monotonic()
+
+        return self.healthy[index]
+
+    def on_error(self, context) -> None:
+        """take a replica out of the rotation once a query fails on it"""
+        if context.is_disconnect or isinstance(
+            context.sqlalchemy_exception, OperationalError
+        ):
+            index = self.engines.index(context.engine)
+            self.healthy[index] = False
+            self.checked[index] = monotonic()
+
+    def get(self):
+        """get the next healthy replica
+        return  engine      Engine      replica engine, None when every replica is down
+        """
+        for _ in self.engines:
+            index = next(self.counter) % len(self.engines)
+
+            if monotonic() - self.checked[index] >= self.interval:
+                self.ping(index)
+
+            if self.healthy[index]:
+                return self.engines[index]
+
+        return None
+
+
+replicas = ReplicaPool(
+    [url for url in environ.get("DATABASE_REPLICA_URLS", "").split(",") if url],
+    float(environ.get("REPLICA_HEALTH_INTERVAL", 30)),
+)
+
+
+async def dispose_engines() -> None:
+    """close the pooled connections of the asyncio engines, see asgi.py"""
+    for engine_ in [engine, *replicas.engines]:
+        await AsyncEngine(engine_).dispose()
+
+
+# seconds a client reads from the primary after a write, see base_app
+REPLICA_READ_YOUR_WRITES = int(environ.get("REPLICA_READ_YOUR_WRITES", 5))
+
+
+class RoutingSession(orm.Session):
+    """send the SELECTs of read blocks to the replica picked for the block,
+    everything else including flushes to the primary engine
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replica = self.info.get("replica")
+
+        if replica is not None and not self._flushing:
+            return replica
+
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def session_scope():
+    """scope of the sessions of asyncio engines: the request, served by a worker
+    thread and the event loop, else the asyncio task or the thread
+    return  scope       Object      key of the session registry
+    """
+    if has_request_context():
+        return id(request._get_current_object())
+
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+
+    return task if task is not None else get_ident()
+
+
+class TaskRegistry:
+    """registry of TaskSession, hands out the sync facade of the AsyncSession
+    of the current scope so BaseModel runs unchanged inside run_sync
+    """
+
+    def __init__(self, async_session) -> None:
+        self.async_session = async_session
+
+    def __call__(self):
+        return self.async_session().sync_session
+
+    def has(self) -> bool:
+        return self.async_session.registry.has()
+
+    def clear(self) -> None:
+        self.async_session.registry.clear()
+
+
+class TaskSession(scoped_session):
+    """scoped_session of the asyncio engines, async_session commits, rolls back
+    and closes the AsyncSession of the request, see BaseAsyncResource
+    """
+
+    def __init__(self, async_session) -> None:
+        self.async_session = async_session
+        self.session_factory = async_session.session_factory
+        self.registry = TaskRegistry(async_session)
+
+
+def create_session(engine_):
+    """create the session registry of the primary engine
+    param   engine_     Engine      primary engine
+    return  session     Session     scoped_session, TaskSession on asyncio engines
+    """
+    if not engine_.dialect.is_async:
+        return scoped_session(
+            sessionmaker(bind=engine_, class_=RoutingSession, query_cls=BaseQuery)
+        )
+
+    return TaskSession(
+        async_scoped_session(
+            async_sessionmaker(
+                AsyncEngine(engine_),
+                sync_session_class=RoutingSession,
+                query_cls=BaseQuery,
+                expire_on_commit=False,
+            ),
+            scopefunc=session_scope,
+        )
+    )
+
+
+session = create_session(engine)
+
+
+class Mapping:
+    """mapper metadata of a model read by the hot paths, built once when the
+    mapper is configured instead of walking mapper.attrs on every instance
+    """
+
+    def __init__(self, mapper) -> None:
+        self.mapper = mapper
+
+        # (property, column name) in mapper order, column name None for relationships
+        self.properties = tuple(
+            (attr, attr.columns[0].name if isinstance(attr, ColumnProperty) else None)
+            for attr in mapper.attrs
+            if isinstance(attr, (ColumnProperty, RelationshipProperty))
+        )
+        self.columns = {
+            attr.columns[0].name: attr.columns[0] for attr in mapper.column_attrs
+        }
+        self.python_types = {
+            name: get_python_type(column) for name, column in self.columns.items()
+        }
+        self.relationships = dict(mapper.relationships.items())
+
+        # relationships whose child holds the <table>_id foreign key back to us
+        self.back_references = {
+            key: f"{mapper.local_table.name}_id"
+            in [
+                f.key
+                for f in relationship.mapper.column_attrs
+                if f.columns[0].foreign_keys
+            ]
+            for key, relationship in self.relationships.items()
+        }
+
+    @cached_property
+    def cache_tables(self) -> tuple:
+        """tables whose writes change the serialized rows of the model: its own,
+        and the tables reachable through relationships, which nested fields dump
+        """
+        tables, seen, mappers = set(), set(), [self.mapper]
+
+        while mappers:
+            mapper = mappers.pop()
+            if mapper in seen:
+                continue
+
+            seen.add(mapper)
+            tables.add(mapper.local_table.name)
+
+            for relationship in mapper.relationships:
+                if relationship.secondary is not None:
+                    tables.add(relationship.secondary.name)
+                mappers.append(relationship.mapper)
+
+        return tuple(sorted(tables))
+
+    @cached_property
+    def related_freshness(self) -> tuple:
+        """scalar subqueries of max(updated_at) and count of the tables nested
+        fields dump, their writes change the serialized rows of the model
+        """
+        tables = self.mapper.local_table.metadata.tables
+        subqueries = []
+
+        for name in self.cache_tables:
+            if name == self.mapper.local_table.name:
+                continue
+
+            table = tables[name]
+            aggregates = (
+                [func.max(table.c.updated_at), func.count()]
+                if "updated_at" in table.c
+                else [func.count()]
+            )
+            subqueries += [
+                select(aggregate).select_from(table).correlate(None).scalar_subquery()
+                for aggregate in aggregates
+            ]
+
+        return tuple(subqueries)
+
+    @cached_property
+    def dependents(self) -> tuple:
+        """relationships whose rows go with ours: cascaded one-to-many children
+        and the association rows of many-to-many relationships
+        """
+        return tuple(
+            relationship
+            for relationship in self.relationships.values()
+            if relationship.secondary is not None
+            or (relationship.direction is ONETOMANY and relationship.cascade.delete)
+        )
+
+    @cached_property
+    def setters(self) -> bool:
+        """the model transforms the values it is given, through a __setattr__
+        override like the password hashing of create:authentication or through
+        @validates hooks, statements built from raw values would bypass them
+        """
+        mro = self.mapper.class_.__mro__
+
+        return bool(self.mapper.validators) or any(
+            "__setattr__" in vars(cls) for cls in mro[: mro.index(BaseModel)]
+        )
+
+
+def delete_dependents(query) -> None:
+    """bulk delete the rows depending on the rows of a query before they are
+    deleted, as session.delete would through the cascades of one-to-many
+    relationships and the association rows of many-to-many relationships
+    param   query       BaseQuery   query on the rows about to be deleted
+    """
+    entity = query.column_descriptions[0]["entity"]
+    ids = query.with_entities(entity.id)
+
+    for relationship in entity.__mapping__.dependents:
+        if relationship.secondary is not None:
+            # (our key, its column in the association table)
+            _, column = relationship.synchronize_pairs[0]
+            query.session.execute(
+                relationship.secondary.delete().where(column.in_(ids))
+            )
+
+        else:
+            _, column = relationship.local_remote_pairs[0]
+            children = query.session.query(relationship.mapper.class_).filter(
+                column.in_(ids)
+            )
+
+            delete_dependents(children)
+            children.delete(synchronize_session=False)
+
+
+def get_python_type(column) -> type:
+    """get the python type of a column, object when the type does not define one
+    param   column      Column      mapped column
+    return  type        type        python type of the column values
+    """
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return object
+
+
 Base = declarative_base()
 
 
@@ -71,6 +1113,31 @@ class BaseModel(Base):
 
     __temp__ = None
 
+    # sort key used for cursor pagination, None keeps LIMIT/OFFSET
+    __cursor__ = None
+
+    # strategy used to count total records of paginated queries
+    __count__ = environ.get("PAGINATION_COUNT", "exact")
+
+    # sparse fieldset requested by the client, None dumps every field
+    __fields__ = None
+
+    # mapper metadata, set for every model once its mapper is configured
+    __mapping__ = None
+
+    # full-text search engine (tsvector, trgm or fts5), None keeps LIKE filters
+    __search__ = None
+
+    # column groups the resources filter or sort on, see flaskforge report:indexes
+    __filters__ = ()
+
+    # seconds the serialized reads are cached, True for QUERY_CACHE_TTL, None disables
+    __cache__ = None
+
+    # key the next jsonify stores its result under, result of a cache hit
+    __cache_key__ = None
+    __cache_hit__ = None
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     created_at = Column(DateTime, default=func.now(), index=True)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), index=True)
@@ -78,15 +1145,10 @@ class BaseModel(Base):
     def __init__(self, schema: dict = {}):
         self.schema = schema
         self._session = session
-        self.mapper = class_mapper(self.__class__)
-
-        for attr in self.mapper.attrs:
-            # skip none sqlalchemy attributes
-            if not isinstance(attr, (RelationshipProperty, ColumnProperty)):
-                continue
+        self.mapper = self.__mapping__.mapper
 
-            if isinstance(attr, ColumnProperty):
-                column = attr.columns[0].name
+        for attr, column in self.__mapping__.properties:
+            if column is not None:
                 if self.schema.get(column):
                     setattr(self, column, self.schema[column])
                 continue
@@ -94,11 +1156,7 @@ class BaseModel(Base):
             if not self.schema.get(attr.key):
                 continue
 
-            if self.id is not None and f"{self.__class__.__tablename__}_id" not in [
-                f.key
-                for f in attr.mapper.attrs
-                if isinstance(f, ColumnProperty) and f.columns[0].foreign_keys
-            ]:
+            if self.id is not None and not self.__mapping__.back_references[attr.key]:
                 continue
 
             child_model = attr.mapper.class_
@@ -111,26 +1169,180 @@ class BaseModel(Base):
 
             setattr(self, attr.key, child)
 
+    @classmethod
+    def column_values(cls, record: dict, model=None) -> dict:
+        """get the column values of a loaded schema dict as the model sets them,
+        bulk and RETURNING statements write them without model instances
+        param   cls         BaseModel   model class
+        param   record      Dict        loaded schema dict
+        param   model       BaseModel   instance already built from the record
+        return  values      Dict        values of the given columns
+        """
+        columns = cls.__mapping__.columns
+        values = {name: value for name, value in record.items() if name in columns}
+
+        if not cls.__mapping__.setters:
+            return values
+
+        # the constructor only sets the truthy values, None stays unset as in update
+        model = cls(values) if model is None else model
+        for name, value in values.items():
+            if not value and value is not None:
+                setattr(model, name, value)
+
+        return {name: getattr(model, name) for name in values}
+
+    @classmethod
+    def reject_nested(cls, records) -> None:
+        """answer 400 to bulk updates changing relationships, which their
+        UPDATE statements cannot apply
+        param   cls         BaseModel   model class
+        param   records     List|Dict   loaded schema dicts, one for filtered updates
+        """
+
+        def nested(record: dict) -> dict:
+            return {
+                camelcase(key): ["Nested fields cannot be updated in bulk."]
+                for key in cls.__mapping__.relationships.keys()
+                if key in record
+            }
+
+        errors = (
+            {i: nested(r) for i, r in enumerate(records) if nested(r)}
+            if isinstance(records, list)
+            else nested(records)
+        )
+
+        if errors:
+            abort(make_response({"message": "Invalid data", "errors": errors}, 400))
+
+    @classmethod
+    def loader_options(cls) -> tuple:
+        """get loader options for the relationships nested in Schema_
+        param   cls         BaseModel   model class
+        return  options     Tuple       loader options, built once per class
+        """
+        schema = getattr(cls, "Schema_", None)
+        key = (cls, schema)
+
+        if key not in _loader_cache:
+            _loader_cache[key] = (
+                tuple(get_loader_options(class_mapper(cls), schema()))
+                if schema is not None
+                else ()
+            )
+
+        return _loader_cache[key]
+
+    @timed("get_query")
     def get_query(self, expression: dict, **kwargs):
-        q = self._session.query(self.__class__)
+        mapping = self.__mapping__
+
+        # values of filtered columns, nested ones prefixed by their relationship
+        params = {
+            f"c_{name}": expression[name]
+            for name in mapping.columns.keys()
+            if name in expression.keys()
+        }
+        joins = []
+
+        for k, m in mapping.relationships.items():
+            if not expression.get(k):
+                continue
+
+            parameter = (
+                expression[k][0] if isinstance(expression[k], list) else expression[k]
+            )
+            names = tuple(
+                name
+                for name in m.mapper.class_.__mapping__.columns.keys()
+                if name in parameter.keys()
+            )
+
+            params.update({f"r_{k}_{name}": parameter[name] for name in names})
+            joins.append((k, names))
+
+        shape = (
+            self.__class__,
+            getattr(self, "Schema_", None),
+            tuple(params.keys()),
+            tuple(joins),
+            bool(kwargs.get("search")),
+            kwargs.get("fields") or None,
+            kwargs.get("load", True),
+        )
+
+        with _statement_cache_lock:
+            q = _statement_cache.get(shape)
+
+            if q is None:
+                _statement_cache_stats["misses"] += 1
+            else:
+                _statement_cache_stats["hits"] += 1
+                _statement_cache.move_to_end(shape)
+
+        if q is None:
+            q = self.build_query(*shape[2:])
+
+            with _statement_cache_lock:
+                _statement_cache[shape] = q
+                while len(_statement_cache) > STATEMENT_CACHE_SIZE:
+                    _statement_cache.popitem(last=False)
+
+        return q.with_session(self._session()).params(params)
+
+    def build_query(self, params, joins, search, fields_, load):
+        """build the statement of a filter shape with bound parameters
+        param   params      Tuple       names of the bound parameters
+        param   joins       Tuple       joined relationships and their filtered columns
+        param   search      Bool        match text columns with contains
+        param   fields_     Tuple       sparse fieldset, None loads every field
+        param   load        Bool        eager load nested relationships
+        return  query       BaseQuery   query without session
+        """
+        q = BaseQuery(self.__class__)
+        mapping = self.__mapping__
+
+        if fields_:
+            q = q.options(
+                *get_fieldset_options(
+                    self.mapper,
+                    self.Schema_(),
+                    fields_ + ((self.__cursor__,) if self.__cursor__ else ()),
+                )
+            )
+        elif load:
+            q = q.options(*self.loader_options())
+
+        # text filters handled by the search engine index
+        searched = [
+            name
+            for name in mapping.columns.keys()
+            if f"c_{name}" in params
+            and search
+            and self.__search__
+            and issubclass(mapping.python_types[name], str)
+        ]
 
-        for attr in self.mapper.attrs:
-            if not isinstance(attr, ColumnProperty):
+        for name, column_ in mapping.columns.items():
+            if f"c_{name}" not in params:
                 continue
 
-            column = attr.columns[0]
-            if column.name not in expression.keys():
+            if name in searched and self.__search__ != "trgm":
                 continue
 
+            value = bindparam(f"c_{name}", type_=column_.type)
             q = (
-                q.filter(column.contains(expression.get(column.name)))
-                if kwargs.get("search") and issubclass(column.type.python_type, str)
-                else q.filter(column == expression.get(column.name))
+                q.filter(column_.contains(value))
+                if search and issubclass(mapping.python_types[name], str)
+                else q.filter(column_ == value)
             )
 
-        for k, m in self.mapper.relationships.items():
-            if not expression.get(k):
-                continue
+        if searched:
+            q = self.search_query(q, searched)
+
+        for k, names in joins:
+            m = mapping.relationships[k]
 
             q = (
                 q.join(m.mapper.class_)
@@ -138,63 +1350,254 @@ class BaseModel(Base):
                 else q.join(m.secondary).join(m.mapper.class_)
             )
 
-            for attr in m.mapper.attrs:
-                if not isinstance(attr, ColumnProperty):
-                    continue
-                column = attr.columns[0]
-
-                if column.name not in (
-                    expression[k].keys()
-                    if isinstance(expression[k], dict)
-                    else expression[k][0].keys()
-                ):
-                    continue
+            child = m.mapper.class_.__mapping__
 
-                parameter = (
-                    expression[k][0]
-                    if isinstance(expression[k], list)
-                    else expression[k]
-                )
+            for name in names:
+                column_ = child.columns[name]
+                value = bindparam(f"r_{k}_{name}", type_=column_.type)
 
                 q = (
-                    q.filter(column.contains(parameter[column.name]))
-                    if kwargs.get("search") and isinstance(column.type.python_type, str)
-                    else q.filter(column == parameter[column.name])
+                    q.filter(column_.contains(value))
+                    if search and issubclass(child.python_types[name], str)
+                    else q.filter(column_ == value)
                 )
 
         return q
 
-    def get(self, expression: dict):
-        self.__temp__ = self.get_query(expression).one()
+    def search_query(self, q, names: list):
+        """match text filters through the search engine index, ranked best first
+        param   q           BaseQuery   query of the filter shape
+        param   names       List        filtered text columns
+        return  query       BaseQuery   filtered and ranked query
+        """
+        tablename = self.__tablename__
+        values = [bindparam(f"c_{name}", type_=String()) for name in names]
+
+        # generated tsvector column added by the search revision
+        if self.__search__ == "tsvector":
+            vector = literal_column(f"{tablename}.search_vector")
+            query = func.plainto_tsquery("simple", func.concat_ws(" ", *values))
+
+            return q.filter(vector.op("@@")(query)).order_by(
+                func.ts_rank(vector, query).desc()
+            )
+
+        # LIKE filters are served by the gin_trgm_ops indexes
+        if self.__search__ == "trgm":
+            similarities = [
+                func.similarity(self.__mapping__.columns[name], value)
+                for name, value in zip(names, values)
+            ]
+            rank = similarities[0]
+            for similarity in similarities[1:]:
+                rank = rank + similarity
+
+            return q.order_by(rank.desc())
+
+        # FTS5 shadow table kept in sync by triggers, prefix match per column
+        search = table(f"search_{tablename}", column("rowid"), column("rank"))
+        terms = [
+            literal(f'{name} : "', String())
+            + func.replace(value, '"', '""')
+            + literal('" *', String())
+            for name, value in zip(names, values)
+        ]
+        match = terms[0]
+        for term in terms[1:]:
+            match = match + literal(" AND ", String()) + term
+
+        return (
+            q.join(search, search.c.rowid == self.__class__.id)
+            .filter(literal_column(f"search_{tablename}").op("MATCH")(match))
+            .order_by(search.c.rank)
+        )
+
+    @contextmanager
+    def read_replica(self):
+        """route the SELECTs of the block to one replica, unless no replica is
+        configured or healthy, or the client wrote within REPLICA_READ_YOUR_WRITES
+        """
+        info = self._session.info
+
+        replica = (
+            replicas.get()
+            if replicas.engines and not info.get("primary") and not info.get("written")
+            else None
+        )
+        info["replica"] = replica
+
+        try:
+            yield replica
+        finally:
+            info.pop("replica", None)
+
+    def cache_lookup(self, method: str, expression: dict, pagination: dict) -> bool:
+        """look up the serialized result of a read, on a miss jsonify stores it
+        param   method      String      get, get_all or search
+        param   expression  Dict        filters in the get_query format
+        param   pagination  Dict        pagination and sparse fieldset
+        return  hit         Bool        jsonify returns the cached result
+        """
+        self.__cache_key__ = self.__cache_hit__ = None
+
+        # streamed lists are never held in memory, let alone cached
+        if not self.__cache__ or query_cache is None or pagination.get("page", 1) < 0:
+            return False
+
+        # the versions of the related tables change the key once they are written
+        versions = query_cache.versions(self.__mapping__.cache_tables)
+        if versions is None:
+            return False
+
+        key = json.dumps(
+            [
+                self.__tablename__,
+                getattr(self.Schema_, "__name__", None),
+                method,
+                expression,
+                pagination,
+                self.__cursor__,
+                self.__count__,
+                self.__search__,
+                versions,
+            ],
+            sort_keys=True,
+            default=str,
+            separators=(",", ":"),
+        )
+        key = blake2b(key.encode(), digest_size=16).hexdigest()
+
+        hit = query_cache.get(key)
+
+        with _query_cache_lock:
+            _query_cache_stats["misses" if hit is None else "hits"] += 1
+
+        if hit is None:
+            self.__cache_key__ = key
+            return False
+
+        self.__cache_hit__ = hit
+        return True
+
+    def freshness(self, expression: dict, search: bool = False) -> tuple:
+        """get what the rows of a read depend on, without loading them
+        param   expression  Dict        filters in the get_query format
+        param   search      Bool        match text columns like search
+        return  freshness   Tuple       (max updated_at, count, max updated_at and
+                                        count of the related tables)
+        """
+        q = self.get_query(expression, search=search, load=False).order_by(None)
+
+        with self.read_replica():
+            last_modified, total, *related = q.with_entities(
+                func.max(self.__class__.updated_at),
+                func.count(),
+                *self.__mapping__.related_freshness,
+            ).one()
+
+        return last_modified, total, related
+
+    def get(self, expression: dict, pagination: dict = dict()):
+        self.__fields__ = pagination.get("fields") or None
+
+        if self.cache_lookup("get", expression, pagination):
+            return
+
+        with self.read_replica():
+            self.__temp__ = self.get_query(expression, fields=self.__fields__).one()
 
     def get_all(self, expression: dict, pagination: dict) -> list:
+        if self.cache_lookup("get_all", expression, pagination):
+            return self.__temp__
+
+        pagination = dict(pagination)
+        self.__fields__ = pagination.pop("fields", None) or None
 
-        self.__temp__ = self.get_query(expression).paginate(**pagination)
+        with self.read_replica():
+            self.__temp__ = self.get_query(expression, fields=self.__fields__).paginate(
+                **pagination, sort_key=self.__cursor__, count=self.__count__
+            )
 
         return self.__temp__
 
     def search(self, expression: dict, pagination: dict):
-        self.__temp__ = self.get_query(expression, search=True).paginate(**pagination)
+        if self.cache_lookup("search", expression, pagination):
+            return
+
+        pagination = dict(pagination)
+        self.__fields__ = pagination.pop("fields", None) or None
+
+        with self.read_replica():
+            self.__temp__ = self.get_query(
+                expression, search=True, fields=self.__fields__
+            ).paginate(**pagination, sort_key=self.__cursor__, count=self.__count__)
 
     def add(self) -> None:
 
         self._session.add(self)
         self.commit_()
 
+    @classmethod
+    def bulk_add(cls, records: list) -> list:
+        """insert many records with multi-row INSERT in one transaction
+        param   cls         BaseModel   model class
+        param   records     List        loaded schema dicts
+        return  ids         List        ids of the inserted records in order
+        """
+        mapper = class_mapper(cls)
+
+        # nested children need the unit of work to resolve foreign keys
+        if any(k in r for r in records for k in mapper.relationships.keys()):
+            models = [cls(r) for r in records]
+            session.add_all(models)
+            cls.commit_()
+
+            return [m.id for m in models]
+
+        # hashed or validated columns are set through instances, see column_values
+        rows = [cls.column_values(r) for r in records]
+
+        dialect = session.get_bind().dialect
+
+        if not dialect.insert_executemany_returning:
+            session.execute(insert(cls), rows)
+            cls.commit_()
+
+            return []
+
+        # SQLite cannot sort batched RETURNING rows and would fall back to one
+        # INSERT per row, its rowids already follow the VALUES order
+        ids = (
+            session.execute(
+                insert(cls).returning(
+                    cls.id, sort_by_parameter_order=dialect.name != "sqlite"
+                ),
+                rows,
+            )
+            .scalars()
+            .all()
+        )
+        cls.commit_()
+
+        return ids
+
     def update(self):
+        # without relationship changes one UPDATE ... RETURNING is enough
+        if (
+            not any(k in self.schema for k in self.__mapping__.relationships.keys())
+            and self._session.get_bind().dialect.update_returning
+        ):
+            return self.update_returning()
+
         model = (
             self._session.query(self.__class__)
             .filter(self.__class__.id == self.schema["id"])
             .one()
         )
 
-        for attr in self.mapper.attrs:
-            # skip not SQLAlchemy properties
-            if not isinstance(attr, (ColumnProperty, RelationshipProperty)):
-                continue
-
+        for attr, column in self.__mapping__.properties:
             # update commons fields
-            if isinstance(attr, ColumnProperty):
+            if column is not None:
                 # skip not
                 if getattr(self, attr.key) is None:
                     continue
@@ -228,6 +1631,157 @@ class BaseModel(Base):
 
         self.__temp__ = model
 
+    def update_returning(self):
+        """update the given columns of a record and keep the returned row
+        param   self        BaseModel   model holding the loaded schema
+        return  row         Dict        updated columns keyed by name, the loaded
+                                        record when the response nests relationships
+        """
+        table = self.__class__.__table__
+
+        values = {
+            name: value
+            for name, value in self.column_values(self.schema, self).items()
+            if name != "id" and value is not None
+        }
+        statement = update(table).where(table.c.id == self.schema["id"]).values(values)
+
+        # nested fields of the response need the related rows, the returned row
+        # lacks them, load the record with them once it is updated
+        if self.dumps_relationships():
+            self._session.execute(statement)
+            self.commit_()
+
+            self.__temp__ = (
+                self.get_query({"id": self.schema["id"]}, fields=self.__fields__)
+                .populate_existing()
+                .one()
+            )
+
+            return self.__temp__
+
+        row = self._session.execute(statement.returning(*table.c)).one()
+        self.commit_()
+
+        self.__temp__ = dict(row._mapping)
+
+        return self.__temp__
+
+    def dumps_relationships(self) -> bool:
+        """check the response schema dumps relationships of the model
+        return  nested      Bool        a dumped field reads a relationship
+        """
+        schema = get_schema(self.Schema_, only=self.__fields__)
+
+        return any(
+            (field.attribute or name) in self.__mapping__.relationships
+            for name, field in schema.fields.items()
+        )
+
+    @classmethod
+    def bulk_update(cls, records: list) -> int:
+        """update many records by id with executemany UPDATE statements
+        param   cls         BaseModel   model class
+        param   records     List        loaded schema dicts including id
+        return  total       Int         number of updated rows
+        """
+        cls.reject_nested(records)
+
+        table = cls.__table__
+        dialect = session.get_bind().dialect
+        groups = {}
+
+        # executemany needs the same SET clause, group records by their columns
+        for record in records:
+            values = cls.column_values(record)
+            columns = tuple(k for k in values.keys() if k != "id")
+            groups.setdefault(columns, []).append(
+                {**{f"b_{k}": values[k] for k in columns}, "b_id": record["id"]}
+            )
+
+        total = 0
+        for columns, rows in groups.items():
+            if not columns:
+                continue
+
+            result = session.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values({k: bindparam(f"b_{k}") for k in columns}),
+                rows,
+            )
+            total += (
+                result.rowcount if dialect.supports_sane_multi_rowcount else len(rows)
+            )
+
+        cls.commit_()
+
+        return total
+
+    def get_bulk_query(self, expression: dict):
+        """get a query on the rows matching a filter expression that supports
+        bulk UPDATE and DELETE, joined filters are moved into an id subquery
+        param   expression  Dict        filters in the get_query format
+        return  query       BaseQuery   query without joins or loader options
+        """
+        q = self.get_query(expression, load=False)
+
+        if not any(expression.get(k) for k in self.__mapping__.relationships.keys()):
+            return q
+
+        return self._session.query(self.__class__).filter(
+            self.__class__.id.in_(q.with_entities(self.__class__.id))
+        )
+
+    def update_where(self, expression: dict, changes: dict) -> int:
+        """update every row matching a filter expression in one statement
+        param   expression  Dict    filters in the get_query format
+        param   changes     Dict    loaded schema dict of the new values
+        return  total       Int     number of updated rows
+        """
+        self.reject_nested(changes)
+
+        values = {
+            name: value
+            for name, value in self.column_values(changes).items()
+            if name != "id"
+        }
+
+        total = (
+            self.get_bulk_query(expression).update(values, synchronize_session=False)
+            if values
+            else 0
+        )
+        self.commit_()
+
+        return total
+
+    def delete_where(self, expression: dict) -> int:
+        """delete every row matching a filter expression in one statement, the
+        cascaded children and association rows are deleted first by id subquery
+        param   expression  Dict    filters in the get_query format
+        return  total       Int     number of deleted rows
+        """
+        query = self.get_bulk_query(expression)
+
+        if not self.__mapping__.dependents:
+            total = query.delete(synchronize_session=False)
+        else:
+            # the filter may join the dependents, fix the ids before deleting them
+            ids = [id_ for id_, in query.with_entities(self.__class__.id)]
+            total = 0
+
+            for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+                chunk = self._session.query(self.__class__).filter(
+                    self.__class__.id.in_(ids[start : start + DELETE_CHUNK_SIZE])
+                )
+
+                delete_dependents(chunk)
+                total += chunk.delete(synchronize_session=False)
+        self.commit_()
+
+        return total
+
     def delete(self):
         if not self.id:
             raise AttributeError(f"Cannot delete NoneType of {self.__class__}")
@@ -237,24 +1791,187 @@ class BaseModel(Base):
         ).delete()
         self.commit_()
 
-    def commit_(self):
-        self._session.commit()
+    @classmethod
+    # requests only flush here, their COMMIT is timed by dispatch_request
+    @timed("flush")
+    def commit_(cls):
+        """commit the pending changes, only flush them when the request commits
+        once at its end, see BaseResource.dispatch_request
+        """
+        # cached reads of the model and its relationships are dropped on commit
+        session.info.setdefault("invalidate", set()).update(
+            cls.__mapping__.cache_tables
+        )
+
+        if session.info.get("managed"):
+            session.flush()
+        else:
+            session.commit()
+
+        # later reads of this client stay on the primary, see base_app
+        session.info["written"] = True
 
     def rollback(self):
         try:
             self._session.rollback()
-        except SQLAlchemyError():
+        except SQLAlchemyError:
             ...
 
+    @timed("jsonify")
     def jsonify(self):
+        if self.__cache_hit__ is not None:
+            return self.__cache_hit__
+
         data = self if self.__temp__ is None else self.__temp__
 
-        Schema = (
-            create_response_schema(self.Schema_)
-            if not isinstance(data, self.__class__)
-            else self.Schema_
+        if isinstance(data, Stream):
+            return self.stream(data)
+
+        schema = (
+            get_schema(
+                create_response_schema(
+                    self.Schema_,
+                    only=self.__fields__,
+                    # keyset pages have no page number, only they carry cursors
+                    cursor=isinstance(data, Paginate) and data.page is None,
+                )
+            )
+            if not isinstance(data, (self.__class__, dict))
+            else get_schema(self.Schema_, only=self.__fields__)
+        )
+
+        result = (
+            self.get_dump(schema)(data)
+            if isinstance(data, (BaseModel, Paginate))
+            else schema.dump(data)
         )
 
-        schema = Schema()
+        if self.__cache_key__ is not None:
+            query_cache.set(
+                self.__cache_key__,
+                result,
+                QUERY_CACHE_TTL if self.__cache__ is True else self.__cache__,
+            )
+            self.__cache_key__ = None
+
+        return result
+
+    def get_dump(self, schema):
+        """get the dump of a schema instance, compiled with COMPILED_SERIALIZER
+        param   schema      Schema      shared schema instance
+        return  dump        Function    dump(obj) of the schema
+        """
+        if not COMPILED_SERIALIZER:
+            return schema.dump
+
+        # imported lazily, the generator imports the models before the schemas
+        from schemas.base_schema import get_serializer
+
+        return get_serializer(schema)
+
+    def stream(self, stream: Stream) -> Response:
+        """serialize an unpaginated list chunk by chunk while it is sent, as
+        NDJSON when the client accepts application/x-ndjson else a JSON array
+        param   stream      Stream      query of the rows and its replica
+        return  response    Response    streamed response, memory flat in the rows
+        """
+        schema = get_schema(self.Schema_, only=self.__fields__, many=True)
+        dump = self.get_dump(schema)
+        ndjson = (
+            request.accept_mimetypes.best_match(("application/json", NDJSON)) == NDJSON
+        )
+        dumps = current_app.json.dumps
+
+        # the generator runs after the request scope removed its session, it
+        # keeps the session of the query and closes it once the rows are sent
+        session_ = stream.query.session
+        async_session = self._session.async_session() if USE_ASYNC else None
+        rows = None
+
+        def run(func):
+            if async_session is None:
+                return func()
+
+            # asgi.py sends the response from a worker thread, not the event loop
+            from asgiref.sync import async_to_sync
+
+            return async_to_sync(async_session.run_sync)(lambda _: func())
+
+        def fetch_chunk():
+            nonlocal rows
+            session_.info["replica"] = stream.replica
+
+            try:
+                # yield_per reads through a server-side cursor, rows leave the
+                # identity map once the chunk is serialized
+                if rows is None:
+                    rows = iter(stream.query.yield_per(STREAM_CHUNK_SIZE))
+
+                return dump(list(islice(rows, STREAM_CHUNK_SIZE)))
+            finally:
+                session_.info.pop("replica", None)
+
+        def generate():
+            separator = "" if ndjson else "["
+
+            try:
+                while True:
+                    items = run(fetch_chunk)
+                    if not items:
+                        break
+
+                    if ndjson:
+                        yield "".join(f"{dumps(item)}\n" for item in items)
+                    else:
+                        yield separator + ",".join(dumps(item) for item in items)
+                        separator = ","
+
+                if not ndjson:
+                    yield "[]" if separator == "[" else "]"
+            finally:
+                # the cursor holds a connection until the last chunk is sent
+                run(session_.close)
+
+        return Response(generate(), mimetype=NDJSON if ndjson else "application/json")
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def invalidate_cache(session_):
+    """bump the versions of the written tables once their rows are visible"""
+    tables = session_.info.pop("invalidate", None)
+
+    if tables and query_cache is not None:
+        query_cache.bump(tables)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def discard_invalidation(session_):
+    session_.info.pop("invalidate", None)
+
+
+if SERVER_TIMING:
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started", []).append(perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def end_statement(conn, cursor, statement, parameters, context, executemany):
+        """count the statements of the request and their time in the database"""
+        record("db", perf_counter() - conn.info["statement_started"].pop())
+
+    @event.listens_for(Engine, "handle_error")
+    def fail_statement(context) -> None:
+        # failed statements never reach after_cursor_execute
+        if context.connection is None:
+            return
+
+        started = context.connection.info.get("statement_started")
+        if started:
+            record("db", perf_counter() - started.pop())
+
 
-        return schema.dump(data)
+@event.listens_for(BaseModel, "mapper_configured", propagate=True)
+def set_mapping(mapper, cls):
+    """build the mapper metadata of every model deriving from BaseModel"""
+    cls.__mapping__ = Mapping(mapper)
@@ -1,5 +1,9 @@
-from flask import make_response, g
+from flask import make_response, request, g, stream_with_context
 from flask_restful import Api, Resource
+from werkzeug.exceptions import HTTPException
+
+from models.base_model import session
+from utils.helper import timed
 
 
 class Api(Api):
@@ -8,12 +12,41 @@ class Api(Api):
         # Rollback session on error
         model = g.__resource__.model()
         model.rollback()
+
+        # keep client errors raised with abort() instead of masking them as 500
+        if isinstance(err, HTTPException) and err.response is not None:
+            return err.response
+
+        if isinstance(err, HTTPException) and err.code < 500:
+            return make_response({"message": err.description}, err.code)
+
         return make_response({"message": ""}, 500)
 
 
+def stream_response(response):
+    """keep the request context while a streamed list is serialized"""
+    if getattr(response, "is_streamed", False):
+        response.response = stream_with_context(response.response)
+
+    return response
+
+
 class BaseResource(Resource):
     nit_every_request = True
 
     def dispatch_request(self, *args, **kwargs):
         g.__resource__ = self
-        return super().dispatch_request(*args, **kwargs)
+
+        # writes only flush per operation and commit once, reads never commit
+        write = request.method not in ("GET", "HEAD", "OPTIONS")
+        session.info["managed"] = write
+
+        response = super().dispatch_request(*args, **kwargs)
+
+        if write:
+            timed("commit")(session.commit)()
+
+        # hand the connection back to the pool before the response is sent
+        session.close()
+
+        return stream_response(response)
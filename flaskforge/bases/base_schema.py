@@ -1,43 +1,553 @@
+from math import isinf, isnan
+
 from flask import request
 from stringcase import camelcase, snakecase
-from marshmallow import Schema, pre_load, post_dump, fields
+from marshmallow import (
+    Schema,
+    RAISE,
+    ValidationError,
+    pre_load,
+    post_dump,
+    fields,
+    missing,
+    validate,
+)
+from marshmallow.utils import ensure_text_type
 
 
 class BaseSchema(Schema):
+    @classmethod
+    def get_key_tables(cls) -> tuple:
+        """get the key translations of the schema class, built on first use as
+        nested schemas may not resolve while the class is created
+        return  tables  Tuple   (request key -> snake_case key, nested snake_case
+                                key -> ((nested field, nested key), ...),
+                                field key -> camelCase key)
+        """
+        tables = cls.__dict__.get("__key_tables__")
+        if tables is not None:
+            return tables
+
+        # fields of an instance, resolving the nested schemas of the declared
+        # fields would cache them without the only/exclude of later instances
+        declared = cls().fields
+        names = list(declared)
+        nested = {}
+
+        for name, field in declared.items():
+            if isinstance(field, fields.Nested):
+                nested[name] = field
+                names += [f"{name}_{nf}" for nf in field.schema.fields]
+
+        snake = {}
+        for name in names:
+            for key in (name, camelcase(name)):
+                snake[key] = snakecase(key)
+
+        # query string keys flattening a nested field, as nested_field_name
+        prefixes = {}
+        for key in set(snake.values()):
+            matches = tuple(
+                (f, key.replace(f"{f}_", "")) for f in nested if key.startswith(f"{f}_")
+            )
+            if matches:
+                prefixes[key] = matches
+
+        camel = {
+            key: camelcase(key)
+            for key in (field.data_key or name for name, field in declared.items())
+        }
+
+        tables = (snake, prefixes, camel)
+        setattr(cls, "__key_tables__", tables)
+
+        return tables
+
     @pre_load
     def to_snakecase(self, data, **kwargs):
-        local_data = {snakecase(k): v for k, v in data.items()}
-        if request.method == "GET":
-            return {
-                f: (
-                    (
-                        [
-                            {
-                                nf.replace(f"{f}_", ""): nv
-                                for nf, nv in local_data.items()
-                                if nf.startswith(f"{f}_")
-                            }
-                        ]
-                        if v.schema.many
-                        else {
-                            nf.replace(f"{f}_", ""): nv
-                            for nf, nv in local_data.items()
-                            if nf.startswith(f"{f}_")
-                        }
-                    )
-                    if isinstance(v, fields.Nested)
-                    else local_data.get(f)
-                )
-                for f, v in self.fields.items()
-                if local_data.get(f) or isinstance(v, fields.Nested)
+        snake, prefixes, _ = self.get_key_tables()
+
+        local_data = {
+            snake[k] if k in snake else snakecase(k): v for k, v in data.items()
+        }
+
+        if request.method == "GET" or self.context.get("query"):
+            nested = {
+                f: {} for f, v in self.fields.items() if isinstance(v, fields.Nested)
             }
 
+            # one pass over the keys fills every nested field they flatten
+            for nf, nv in local_data.items():
+                matches = prefixes.get(nf)
+
+                if matches is None and nested:
+                    matches = tuple(
+                        (f, nf.replace(f"{f}_", ""))
+                        for f in nested
+                        if nf.startswith(f"{f}_")
+                    )
+
+                for f, key in matches or ():
+                    if f in nested:
+                        nested[f][key] = nv
+
+            result = {}
+
+            for f, v in self.fields.items():
+                if f in nested:
+                    if local_data.get(f) or nested[f]:
+                        result[f] = [nested[f]] if v.schema.many else nested[f]
+                elif local_data.get(f):
+                    result[f] = local_data.get(f)
+
+            return result
+
         return local_data
 
     @post_dump
     def to_camelcase(self, data, **kwargs):
+        camel = self.get_key_tables()[2]
+
         # return only require data
         if request.method == "PATCH":
-            return {camelcase(k): v for k, v in data.items() if v is not None}
+            return {
+                camel[k] if k in camel else camelcase(k): v
+                for k, v in data.items()
+                if v is not None
+            }
+
+        return {camel[k] if k in camel else camelcase(k): v for k, v in data.items()}
+
+
+def get_formatter(field):
+    """get the formatting of a field as marshmallow applies it after the value
+    is read, None for fields the compiler does not know
+    """
+    kind = type(field)
+
+    if kind is fields.String:
+        return lambda value: value if type(value) is str else ensure_text_type(value)
+
+    if kind in (fields.Integer, fields.Float) and not field.as_string:
+        return field.num_type
+
+    if kind is fields.Boolean:
+        truthy, falsy = field.truthy, field.falsy
+
+        def boolean(value):
+            try:
+                if value in truthy:
+                    return True
+                if value in falsy:
+                    return False
+            except TypeError:
+                pass
+
+            return bool(value)
+
+        return boolean
+
+    if kind is fields.DateTime:
+        data_format = field.format or field.DEFAULT_FORMAT
+        format_ = field.SERIALIZATION_FUNCS.get(data_format)
+
+        return format_ or (lambda value: value.strftime(data_format))
+
+    if kind is fields.Raw:
+        return lambda value: value
+
+    return None
+
+
+def compile_schema(schema: Schema):
+    """compile the dump of a schema instance, nested schemas included, into a
+    function reading pre-resolved attributes under precomputed output keys,
+    with the output of schema.dump for the objects of the models
+    param   schema      Schema      schema instance, only and many applied
+    return  dump        Function    dump(obj), None for the schemas with other
+                                    dump hooks, accessors or fields
+    """
+    dump_one = compile_fields(schema)
+
+    if dump_one is None:
+        return None
+
+    def dump(obj):
+        # to_camelcase drops the null values of PATCH responses
+        patch = request.method == "PATCH"
+
+        if schema.many:
+            return [dump_one(item, patch) for item in obj]
+
+        return dump_one(obj, patch)
+
+    return dump
+
+
+def get_serializer(schema: Schema):
+    """get the dump of a shared schema instance, compiled on first use
+    param   schema      Schema      schema instance, e.g. from get_schema
+    return  dump        Function    compiled dump, schema.dump when it cannot be
+    """
+    serializer = schema.__dict__.get("compiled_dump")
+
+    if serializer is None:
+        serializer = compile_schema(schema) or schema.dump
+        schema.__dict__["compiled_dump"] = serializer
+
+    return serializer
+
+
+def compile_fields(schema: Schema):
+    """compile dump_one(obj, patch) of a single object, see compile_schema"""
+    cls = type(schema)
+    camel = isinstance(schema, BaseSchema)
+
+    hooks = {
+        tag: names
+        for tag, names in schema._hooks.items()
+        if tag[0] in ("pre_dump", "post_dump") and names
+    }
+    expected = {("post_dump", False): ["to_camelcase"]} if camel else {}
+
+    if hooks != expected or cls.get_attribute is not Schema.get_attribute:
+        return None
+
+    if camel and cls.to_camelcase is not BaseSchema.to_camelcase:
+        return None
+
+    plan = []
+
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        key = field.data_key or name
+
+        if "." in attribute:
+            return None
+
+        if type(field) is fields.Nested:
+            child = compile_fields(field.schema)
+            if child is None:
+                return None
+
+            many = field.schema.many or field.many
+            plan.append(
+                (camelcase(key) if camel else key, attribute, field, child, many)
+            )
+            continue
+
+        format_ = get_formatter(field)
+        if format_ is None:
+            return None
+
+        plan.append((camelcase(key) if camel else key, attribute, field, format_, None))
+
+    def dump_one(obj, patch):
+        result = {}
+
+        for key, attribute, field, format_, many in plan:
+            value = getattr(obj, attribute, missing)
+
+            if value is missing:
+                default = field.dump_default
+                value = default() if callable(default) else default
+
+                if value is missing:
+                    continue
+
+            if value is not None:
+                if many is None:
+                    value = format_(value)
+                elif many:
+                    value = [format_(item, patch) for item in value]
+                else:
+                    value = format_(value, patch)
+
+            if value is None and patch and camel:
+                continue
+
+            result[key] = value
+
+        return result
+
+    return dump_one
+
+
+class Fallback(Exception):
+    """input the compiled loader leaves to Schema.load, which raises the errors"""
+
+
+def get_coercion(field):
+    """get the deserialization of a field as marshmallow applies it to values
+    other than None, raising Fallback where marshmallow raises an error
+    """
+    kind = type(field)
+
+    if kind is fields.String:
+
+        def string(value):
+            if type(value) is str:
+                return value
+
+            if not isinstance(value, (str, bytes)):
+                raise Fallback
+
+            try:
+                return ensure_text_type(value)
+            except UnicodeDecodeError:
+                raise Fallback
+
+        return string
+
+    if kind in (fields.Integer, fields.Float):
+        num_type, strict = field.num_type, getattr(field, "strict", False)
+        finite = kind is fields.Float and field.allow_nan is False
+
+        def number(value):
+            if value is True or value is False:
+                raise Fallback
+
+            if strict and not isinstance(value, int):
+                raise Fallback
+
+            try:
+                value = num_type(value)
+            except (TypeError, ValueError, OverflowError):
+                raise Fallback
+
+            if finite and (isnan(value) or isinf(value)):
+                raise Fallback
+
+            return value
+
+        return number
+
+    if kind is fields.Boolean:
+        truthy, falsy = field.truthy, field.falsy
+
+        def boolean(value):
+            if not truthy:
+                return bool(value)
+
+            try:
+                if value in truthy:
+                    return True
+                if value in falsy:
+                    return False
+            except TypeError:
+                pass
+
+            raise Fallback
+
+        return boolean
+
+    if kind is fields.Raw:
+        return lambda value: value
+
+    # other fields keep their own deserialization and validators
+    def deserialize(value):
+        try:
+            return field.deserialize(value)
+        except ValidationError:
+            raise Fallback
+
+    return deserialize
+
+
+def get_validation(field):
+    """get the validators of a field, validate.Length checked inline"""
+    checks = []
+
+    for validator in field.validators:
+        if type(validator) is validate.Length:
+            low, high, equal = validator.min, validator.max, validator.equal
+
+            def length(value, low=low, high=high, equal=equal):
+                size = len(value)
+
+                return (
+                    size == equal
+                    if equal is not None
+                    else (low is None or size >= low) and (high is None or size <= high)
+                )
+
+            checks.append(length)
+            continue
+
+        def call(value, validator=validator):
+            try:
+                return validator(value) is not False
+            except ValidationError:
+                return False
+
+        checks.append(call)
+
+    return checks
+
+
+def compile_loader(schema: Schema):
+    """compile the load of a schema instance, nested schemas included, into a
+    function mapping the request keys through precomputed key maps, coercing
+    the values and checking required, allow_none and the validators, anything
+    it does not accept is loaded by Schema.load so errors keep their format
+    param   schema      Schema      schema instance, partial and many applied
+    return  load        Function    load(data), None for the schemas with other
+                                    load hooks, unknown handling or partial fields
+    """
+    load_one = compile_load_fields(schema, schema.partial)
+
+    if load_one is None:
+        return None
+
+    def load(data):
+        # query strings are flattened by to_snakecase, marshmallow loads them
+        if request.method == "GET" or schema.context.get("query"):
+            return schema.load(data)
+
+        try:
+            if not schema.many:
+                return load_one(data)
+
+            if type(data) is not list:
+                raise Fallback
+
+            return [load_one(item) for item in data]
+
+        except Fallback:
+            return schema.load(data)
+
+    return load
+
+
+def get_loader(schema: Schema):
+    """get the load of a shared schema instance, compiled on first use
+    param   schema      Schema      schema instance, e.g. from get_schema
+    return  load        Function    compiled load, schema.load when it cannot be
+    """
+    loader = schema.__dict__.get("compiled_load")
+
+    if loader is None:
+        loader = compile_loader(schema) or schema.load
+        schema.__dict__["compiled_load"] = loader
+
+    return loader
+
+
+def compile_load_fields(schema: Schema, partial):
+    """compile load_one(data) of a single object, see compile_loader"""
+    cls = type(schema)
+    camel = isinstance(schema, BaseSchema)
+
+    hooks = {
+        tag: names
+        for tag, names in schema._hooks.items()
+        if tag[0] not in ("pre_dump", "post_dump") and names
+    }
+    expected = {("pre_load", False): ["to_snakecase"]} if camel else {}
+
+    if hooks != expected or schema.unknown != RAISE:
+        return None
+
+    if camel and cls.to_snakecase is not BaseSchema.to_snakecase:
+        return None
+
+    if partial is not None and not isinstance(partial, bool):
+        return None
+
+    plan, keys = [], {}
+
+    for name, field in schema.load_fields.items():
+        attribute = field.attribute or name
+        key = field.data_key or name
+
+        if "." in attribute:
+            return None
+
+        if type(field) is fields.Nested:
+            if field.unknown not in (None, RAISE):
+                return None
+
+            # a partial load is partial down the nested schemas
+            child = compile_load_fields(
+                field.schema, partial if partial is not None else field.schema.partial
+            )
+            if child is None:
+                return None
+
+            coerce, many = child, field.schema.many
+        else:
+            coerce, many = get_coercion(field), None
+
+        plan.append((key, attribute, field, coerce, many, get_validation(field)))
+
+        # request keys mapping to the field without calling snakecase
+        keys[key] = key
+        if camel and snakecase(camelcase(key)) == key:
+            keys[camelcase(key)] = key
+
+    names = set(keys.values())
+
+    def load_one(data):
+        if type(data) is not dict:
+            raise Fallback
+
+        raw = {}
+
+        for key, value in data.items():
+            name = keys.get(key)
+
+            if name is None:
+                name = snakecase(key) if camel and isinstance(key, str) else key
+
+                # unknown fields raise with RAISE
+                if name not in names:
+                    raise Fallback
+
+            raw[name] = value
+
+        result = {}
+
+        for key, attribute, field, coerce, many, checks in plan:
+            value = raw.get(key, missing)
+
+            if value is missing:
+                if partial is True:
+                    continue
+
+                if field.required:
+                    raise Fallback
+
+                default = field.load_default
+                value = default() if callable(default) else default
+
+                if value is not missing:
+                    result[attribute] = value
+
+                continue
+
+            if value is None:
+                if not field.allow_none:
+                    raise Fallback
+
+                result[attribute] = None
+                continue
+
+            if many is None:
+                value = coerce(value)
+            elif many:
+                if type(value) is not list:
+                    raise Fallback
+
+                value = [coerce(item) for item in value]
+            else:
+                value = coerce(value)
+
+            for check in checks:
+                if not check(value):
+                    raise Fallback
+
+            result[attribute] = value
+
+        return result
 
-        return {camelcase(k): v for k, v in data.items()}
+    return load_one
@@ -1,6 +1,7 @@
 import os
 from abc import ABC, abstractmethod
 
+from stringcase import snakecase
 from flaskforge.utils.io import StandardIO
 from flaskforge.utils.argument import Argument
 
@@ -42,6 +43,27 @@ class AbstractProvider(ABC):
             "(,", "("
         )
 
+    def check_cursor_key(self, args: object, columns: list):
+        """
+        Check the `--cursor-key` of `--use-cursor` is a column of the model.
+
+        Args:
+            args (object): Command-line arguments.
+            columns (list): The column names of the model.
+
+        Raises:
+            AttributeError: If the cursor key is not a column of the model.
+        """
+        if not getattr(args, "use_cursor", False):
+            return
+
+        key = snakecase(getattr(args, "cursor_key", None) or "id")
+        if key not in columns:
+            raise AttributeError(
+                f"Cursor key {key} is not a column of {args.model} "
+                f"(columns: {', '.join(columns)})"
+            )
+
     @abstractmethod
     def handler(self, args: object):
         """
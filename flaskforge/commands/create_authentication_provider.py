@@ -21,16 +21,19 @@ class CreateAuthentication(AbstractProvider):
         writer = WriterFactory("resource", self.args)
         writer.set_writable("authentication")
 
-        signin = """
-def post(self, schema: dict):
+        # async projects await the model queries in async handlers
+        async_, await_ = ("async ", "await ") if writer.is_async() else ("", "")
+
+        signin = f"""
+{async_}def post(self, schema: dict):
         model = self.model(schema)
-        model.signin()
-        user = model.jsonify()
+        {await_}model.signin()
+        user = {await_}model.jsonify()
         access_token = create_access_token(identity=user)
         refresh_token = create_refresh_token(identity=user)
 
         response = make_response(
-            {"access_token": access_token, "refresh_token": refresh_token,}, 200,
+            {{"access_token": access_token, "refresh_token": refresh_token,}}, 200,
         )
 
         set_access_cookies(response, access_token)
@@ -38,26 +41,26 @@ def post(self, schema: dict):
         return response
 """
 
-        signout = """
-def delete(self, schema: dict = dict()):
+        signout = f"""
+{async_}def delete(self, schema: dict = dict()):
 
-    respone = make_response({"message": "Signout success"}, 200)
+    respone = make_response({{"message": "Signout success"}}, 200)
 
     unset_access_cookies(respone)
 
     return respone
 """
 
-        verify = """
-def get(self):
+        verify = f"""
+{async_}def get(self):
 
     user=get_jwt_identity()
     
     model = self.model()
     
-    model.get(user)
+    {await_}model.get(user)
     
-    return make_response(model.jsonify(), 200)  
+    return make_response({await_}model.jsonify(), 200)  
 """
         method_decorators = f"""{{"post": [validator(UserSchema, only=("{
             self.args.username_field}", "{self.args.password_field
@@ -107,8 +110,10 @@ def verify(self):
 """
 
         signin_method = f"""
-def signin(self):
-    self.get({{{f"'{self.args.username_field}': getattr(self, '{self.args.username_field}')"}}})
+{async_}def signin(self):
+    # verify reads the loaded row, not a cached serialization
+    self.__cache__ = None
+    {await_}self.get({{{f"'{self.args.username_field}': getattr(self, '{self.args.username_field}')"}}})
     self.verify()
 """
 
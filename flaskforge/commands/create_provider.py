@@ -4,6 +4,7 @@ from datetime import datetime
 
 from stringcase import snakecase, pascalcase
 from flaskforge.writers.writer_factory import WriterFactory
+from flaskforge.writers.index_writer import IndexWriter
 from flaskforge.builders.builder_factory import BuilderFactory
 from flaskforge.utils.commons import join_path, exec_command
 from flaskforge.utils.exception import (
@@ -115,7 +116,7 @@ class CreateProvider(AbstractProvider):
             for model in os.listdir(join_path(self.project_path, "models"))
             if not model.startswith("__")
             and "_to_" not in model
-            and model != "base_model.py"
+            and model not in ("base_model.py", "base_async_model.py")
             and model != f"{snakecase(args.model)}_model.py"
         ]
 
@@ -246,7 +247,14 @@ Please run {self.io.color(self.io.CYAN, "flaskforge initapp")} first"""
                 # Finalize and write everything
                 self.io.clear()
 
-                writers = ["model", "schema", "resource", "route", "swagger"]
+                # refuse an unknown cursor key before anything is written
+                self.check_cursor_key(
+                    args,
+                    list(IndexWriter.base_columns)
+                    + [f["attr"].prop[1] for f in fields if "attr" in f],
+                )
+
+                writers = ["model", "index", "schema", "resource", "route", "swagger"]
                 for writer in writers:
                     WriterFactory(writer, args, fields=fields).write_source()
 
@@ -292,7 +300,7 @@ Please run {self.io.color(self.io.CYAN, "flaskforge initapp")} first"""
 
         try:
 
-            confirm_init = False
+            confirm_init = migrated = False
             now = datetime.now()
             # Format the timestamp as YYYY_MM_DD_HH_MM_SS
             timestamp = now.strftime("%Y_%m_%d_%H_%M_%S")
@@ -329,7 +337,7 @@ Please run {self.io.color(self.io.CYAN, "flaskforge initapp")} first"""
                 exec_command(
                     f"""{"docker exec -it api " if use_docker else ""}alembic upgrade head"""
                 )
-                confirm_init = True
+                confirm_init = migrated = True
 
             if (
                 not confirm_init
@@ -344,8 +352,22 @@ Please run {self.io.color(self.io.CYAN, "flaskforge initapp")} first"""
                 exec_command(
                     f"""{"docker exec -it api " if use_docker else ""}alembic upgrade head"""
                 )
-        except DoneExit:
-            ...
+                migrated = True
+
+            # the search index revision must follow the revision creating the table
+            if getattr(args, "search_engine", None):
+                if not migrated:
+                    raise DoneExit(
+                        "Run create:resource with --search-engine once the table is migrated"
+                    )
+
+                WriterFactory("migration", args).write_search_revision()
+                exec_command(
+                    f"""{"docker exec -it api " if use_docker else ""}alembic upgrade head"""
+                )
+        except DoneExit as err:
+            if str(err):
+                self.io.info(str(err))
 
         except Exception as err:
             self.io.error(str(err))
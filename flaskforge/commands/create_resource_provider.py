@@ -1,3 +1,6 @@
+import os
+
+from flaskforge.utils.commons import join_path
 from flaskforge.writers.writer_factory import WriterFactory
 
 from .base_cli_provider import AbstractProvider
@@ -13,9 +16,26 @@ class CreateResourceProvider(AbstractProvider):
                 "Param and Type is required when use-single is flagged"
             )
 
+        index_writer = WriterFactory("index", args)
+        self.check_cursor_key(args, list(index_writer.read_model()[1]))
+        indexes = index_writer.write_source()
+
         writers = ["resource", "route", "swagger"]
 
         for w in writers:
             writer = WriterFactory(w, args)
             writer.set_writable(name)
             writer.write_source()
+
+        if not os.path.isfile(join_path(self.project_path, "alembic.ini")):
+            return
+
+        # the table already exists, only the index revisions are missing
+        migration_writer = WriterFactory("migration", args)
+        if indexes and migration_writer.get_head():
+            migration_writer.write_index_revision(index_writer.tablename, indexes)
+            self.io.info("Filter index revision written, run alembic upgrade head")
+
+        if getattr(args, "search_engine", None):
+            migration_writer.write_search_revision()
+            self.io.info("Search index revision written, run alembic upgrade head")
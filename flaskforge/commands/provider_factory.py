@@ -4,6 +4,7 @@ from .migrate_provider import MigrateProvider
 from .create_resource_provider import CreateResourceProvider
 from .create_authentication_provider import CreateAuthentication
 from .create_relationship_provider import CreateRelationshipProvider
+from .report_indexes_provider import ReportIndexesProvider
 
 
 class ProviderFactory:
@@ -24,6 +25,7 @@ class ProviderFactory:
         "create:resource": CreateResourceProvider,
         "create:authentication": CreateAuthentication,
         "create:relationship": CreateRelationshipProvider,
+        "report:indexes": ReportIndexesProvider,
     }
 
     def __new__(cls, name: str):
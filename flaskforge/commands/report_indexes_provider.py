@@ -0,0 +1,163 @@
+import sys
+import asyncio
+
+from dotenv import load_dotenv
+from sqlalchemy import inspect, UniqueConstraint
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from flaskforge.utils.commons import join_path
+
+from .base_cli_provider import AbstractProvider
+
+
+class ReportIndexesProvider(AbstractProvider):
+    """
+    Report the filtered and sorted columns of the models without a supporting index.
+
+    The columns are read from `__filters__` of every model and compared against the
+    leading columns of the primary key, unique constraints and indexes, either of the
+    model metadata or of the database configured by DATABASE_URL.
+
+    TODO:
+        - Report the foreign key columns used by nested relationship filters.
+    """
+
+    def get_models(self) -> list:
+        """
+        Import the models of the current project.
+
+        Returns:
+            list: The mapped model classes.
+        """
+        load_dotenv(join_path(self.project_path, ".env"))
+
+        if self.project_path not in sys.path:
+            sys.path.insert(0, self.project_path)
+
+        import models  # noqa: F401
+        from models.base_model import BaseModel
+
+        return [mapper.class_ for mapper in BaseModel.registry.mappers]
+
+    def get_metadata_indexes(self, table) -> list:
+        """
+        Get the indexed column groups of a table from the model metadata.
+
+        Args:
+            table (Table): The table of the model.
+
+        Returns:
+            list: Tuples of column names, in index order.
+        """
+        indexes = [tuple(c.name for c in table.primary_key.columns)]
+        indexes += [tuple(c.name for c in index.columns) for index in table.indexes]
+        indexes += [
+            tuple(c.name for c in constraint.columns)
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ]
+        indexes += [(c.name,) for c in table.columns if c.index or c.unique]
+
+        return indexes
+
+    def get_database_indexes(self, inspector, tablename: str) -> list:
+        """
+        Get the indexed column groups of a table from the database.
+
+        Args:
+            inspector (Inspector): Inspector bound to the project engine.
+            tablename (str): The table to inspect.
+
+        Returns:
+            list: Tuples of column names, in index order, None if the table is missing.
+        """
+        if not inspector.has_table(tablename):
+            return None
+
+        indexes = [tuple(inspector.get_pk_constraint(tablename)["constrained_columns"])]
+        indexes += [
+            tuple(index["column_names"]) for index in inspector.get_indexes(tablename)
+        ]
+        indexes += [
+            tuple(constraint["column_names"])
+            for constraint in inspector.get_unique_constraints(tablename)
+        ]
+
+        return indexes
+
+    def report(self, models: list, inspector=None) -> None:
+        """
+        Print every filtered column group no index supports.
+
+        Args:
+            models (list): The mapped model classes.
+            inspector (Inspector, optional): Inspector of the database, None
+                compares against the model metadata.
+        """
+        missing = 0
+
+        for model in sorted(models, key=lambda m: m.__tablename__):
+            table = model.__table__
+            filters = [tuple(f) for f in (getattr(model, "__filters__", None) or ())]
+
+            if not filters:
+                continue
+
+            indexes = (
+                self.get_database_indexes(inspector, table.name)
+                if inspector is not None
+                else self.get_metadata_indexes(table)
+            )
+
+            if indexes is None:
+                self.io.warning(f"{table.name}: table not found in the database")
+                continue
+
+            for columns in filters:
+                if any(index[: len(columns)] == columns for index in indexes):
+                    continue
+
+                missing += 1
+                self.io.print(
+                    f"{table.name}: {', '.join(columns)}", color=self.io.YELLOW
+                )
+
+        if missing:
+            self.io.info(
+                f"{missing} filtered column group(s) without a supporting index",
+                end="\n",
+            )
+        else:
+            self.io.success("Every filtered column has a supporting index", end="\n")
+
+    def handler(self, args: object):
+        """
+        Print every filtered column group no index supports.
+
+        Args:
+            args (object): Command-line arguments.
+        """
+        models = self.get_models()
+
+        if not args.database:
+            return self.report(models)
+
+        from models.base_model import engine
+
+        if not engine.dialect.is_async:
+            return self.report(models, inspect(engine))
+
+        # projects of initapp --async inspect through their asyncio driver
+        async def report_async():
+            async_engine = AsyncEngine(engine)
+
+            try:
+                async with async_engine.connect() as connection:
+                    await connection.run_sync(
+                        lambda sync: self.report(models, inspect(sync))
+                    )
+            finally:
+                # the driver threads of the pooled connections keep the process alive
+                await async_engine.dispose()
+
+        asyncio.run(report_async())
@@ -89,6 +89,21 @@ def main():
             Initializes a project with Docker configuration files.
         """,
     )
+    flask_cli.add_argument(
+        "initapp",
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="""
+        Generate an async project. Models run on the SQLAlchemy asyncio engine (asyncpg or
+        aiosqlite), resources define async handlers and runner.py serves the app through
+        the ASGI entry point asgi.py. Requires flaskforge[async].
+
+        Example:
+            $ flask initapp my_project --async
+            Initializes a project with async models and resources.
+        """,
+    )
     flask_cli.add_argument(
         "initapp",
         "--force",
@@ -194,6 +209,23 @@ def main():
             Uses a search method for querying records of the User model.
         """,
     )
+    flask_cli.add_argument(
+        "create",
+        "--search-engine",
+        choices=["tsvector", "trgm", "fts5"],
+        help="""
+        Serve the text filters of --use-search from a full-text index with ranked results
+        instead of LIKE '%%...%%' scans. An alembic revision creating the index is written
+        once the table is migrated.
+            tsvector    Postgres generated tsvector column with a GIN index
+            trgm        Postgres pg_trgm GIN indexes for substring search
+            fts5        SQLite FTS5 table kept in sync by triggers
+
+        Example:
+            $ flask create User --use-search --search-engine fts5
+            Matches text filters through an FTS5 table ranked by relevance.
+        """,
+    )
     flask_cli.add_argument(
         "create",
         "--use-single",
@@ -206,6 +238,103 @@ def main():
             Uses a search method for querying a single record of the User model.
         """,
     )
+    flask_cli.add_argument(
+        "create",
+        "--use-cursor",
+        action="store_true",
+        help="""
+        Use keyset (cursor) pagination instead of LIMIT/OFFSET for listing records of the User model.
+        The list response returns nextCursor/prevCursor to pass back as ?cursor=.
+
+        Example:
+            $ flask create User --use-cursor
+            Seeks on the id column when paging through records of the User model.
+        """,
+    )
+    flask_cli.add_argument(
+        "create",
+        "--cursor-key",
+        help="""
+        Specify the indexed column used as sort key for cursor pagination (default: id).
+        The id column is always appended as tie-breaker.
+
+        Example:
+            $ flask create User --use-cursor --cursor-key created_at
+            Seeks on (created_at, id) when paging through records of the User model.
+        """,
+    )
+    flask_cli.add_argument(
+        "create",
+        "--count-strategy",
+        choices=["exact", "window", "estimate", "cached", "none"],
+        help="""
+        Specify how the total of paginated records of the User model is counted (default: exact, or the
+        PAGINATION_COUNT environment variable).
+            exact       separate COUNT(*) query
+            window      COUNT(*) OVER() in the page query, single round trip
+            estimate    planner row estimate (Postgres EXPLAIN, SQLite sqlite_stat1)
+            cached      exact count cached per filter for PAGINATION_COUNT_TTL seconds
+            none        skip the total
+
+        Example:
+            $ flask create User --count-strategy window
+            Counts the total of records of the User model in the same query as the page.
+        """,
+    )
+    flask_cli.add_argument(
+        "create",
+        "--use-cache",
+        action="store_true",
+        help="""
+        Cache the serialized GET responses of the resource, keyed by filters and pagination.
+        Writes to the model or its related models invalidate them. The backend is chosen by
+        QUERY_CACHE_BACKEND (memory, redis or none).
+
+        Example:
+            $ flask create User --use-cache
+            Serves repeated reads of users from the cache for QUERY_CACHE_TTL seconds.
+        """,
+    )
+    flask_cli.add_argument(
+        "create",
+        "--cache-ttl",
+        type=int,
+        help="""
+        Specify the seconds the reads of --use-cache are cached (default: QUERY_CACHE_TTL).
+
+        Example:
+            $ flask create User --use-cache --cache-ttl 300
+            Caches the reads of users for five minutes.
+        """,
+    )
+    flask_cli.add_argument(
+        "create",
+        "--use-bulk",
+        action="store_true",
+        help="""
+        Accept a JSON array on POST to create many records of the User model with a single multi-row INSERT.
+        The batch size is limited by the BULK_MAX_BATCH_SIZE environment variable.
+
+        Example:
+            $ flask create User --use-bulk
+            POSTing [{...}, {...}] returns the ids of the created records.
+        """,
+    )
+    flask_cli.add_argument(
+        "create",
+        "--filter",
+        type=str,
+        nargs="+",
+        help="""
+        Specify the columns the User model is filtered or sorted on. Each value gets an index in the
+        model unless an existing index covers it, join columns with a comma for a composite index.
+        The --param of --use-single and the --cursor-key of --use-cursor are indexed as well.
+
+        Example:
+            $ flask create User --filter status country,created_at
+            Indexes status and (country, created_at) of the User model.
+        """,
+    )
     flask_cli.add_argument(
         "create",
         "--param",
@@ -359,6 +488,19 @@ def main():
             Adds a backref to the Child model for easy access back to the Parent model.
         """,
     )
+    flask_cli.add_argument(
+        "create:relationship",
+        "--loader",
+        choices=("selectin", "joined", "subquery", "lazy", "raise"),
+        help="""
+        Pin the loader strategy used when the relationship is serialized as a nested field.
+        By default collections use selectin and single objects use joined loading.
+
+        Example:
+            $ flask create:relationship Parent Child --relation 2 --loader joined
+            Loads the Child rows with a LEFT JOIN on the Parent query.
+        """,
+    )
 
     # Define the "create:resource" command for generating resource-related components
     flask_cli.create_command(
@@ -449,6 +591,23 @@ def main():
             Uses a search method for querying resources.
         """,
     )
+    flask_cli.add_argument(
+        "create:resource",
+        "--search-engine",
+        choices=["tsvector", "trgm", "fts5"],
+        help="""
+        Serve the text filters of --use-search from a full-text index with ranked results
+        instead of LIKE '%%...%%' scans. An alembic revision creating the index is written
+        once the table is migrated.
+            tsvector    Postgres generated tsvector column with a GIN index
+            trgm        Postgres pg_trgm GIN indexes for substring search
+            fts5        SQLite FTS5 table kept in sync by triggers
+
+        Example:
+            $ flask create:resource User --use-search --search-engine fts5
+            Matches text filters through an FTS5 table ranked by relevance.
+        """,
+    )
     flask_cli.add_argument(
         "create:resource",
         "--use-single",
@@ -461,6 +620,103 @@ def main():
             Uses a search method for querying a single resource.
         """,
     )
+    flask_cli.add_argument(
+        "create:resource",
+        "--use-cursor",
+        action="store_true",
+        help="""
+        Use keyset (cursor) pagination instead of LIMIT/OFFSET for listing resources.
+        The list response returns nextCursor/prevCursor to pass back as ?cursor=.
+
+        Example:
+            $ flask create:resource User --use-cursor
+            Seeks on the id column when paging through resources.
+        """,
+    )
+    flask_cli.add_argument(
+        "create:resource",
+        "--cursor-key",
+        help="""
+        Specify the indexed column used as sort key for cursor pagination (default: id).
+        The id column is always appended as tie-breaker.
+
+        Example:
+            $ flask create:resource User --use-cursor --cursor-key created_at
+            Seeks on (created_at, id) when paging through resources.
+        """,
+    )
+    flask_cli.add_argument(
+        "create:resource",
+        "--count-strategy",
+        choices=["exact", "window", "estimate", "cached", "none"],
+        help="""
+        Specify how the total of paginated resources is counted (default: exact, or the
+        PAGINATION_COUNT environment variable).
+            exact       separate COUNT(*) query
+            window      COUNT(*) OVER() in the page query, single round trip
+            estimate    planner row estimate (Postgres EXPLAIN, SQLite sqlite_stat1)
+            cached      exact count cached per filter for PAGINATION_COUNT_TTL seconds
+            none        skip the total
+
+        Example:
+            $ flask create:resource User --count-strategy window
+            Counts the total of resources in the same query as the page.
+        """,
+    )
+    flask_cli.add_argument(
+        "create:resource",
+        "--use-cache",
+        action="store_true",
+        help="""
+        Cache the serialized GET responses of the resource, keyed by filters and pagination.
+        Writes to the model or its related models invalidate them. The backend is chosen by
+        QUERY_CACHE_BACKEND (memory, redis or none).
+
+        Example:
+            $ flask create:resource User --use-cache
+            Serves repeated reads of users from the cache for QUERY_CACHE_TTL seconds.
+        """,
+    )
+    flask_cli.add_argument(
+        "create:resource",
+        "--cache-ttl",
+        type=int,
+        help="""
+        Specify the seconds the reads of --use-cache are cached (default: QUERY_CACHE_TTL).
+
+        Example:
+            $ flask create:resource User --use-cache --cache-ttl 300
+            Caches the reads of users for five minutes.
+        """,
+    )
+    flask_cli.add_argument(
+        "create:resource",
+        "--use-bulk",
+        action="store_true",
+        help="""
+        Accept a JSON array on POST to create many resources with a single multi-row INSERT.
+        The batch size is limited by the BULK_MAX_BATCH_SIZE environment variable.
+
+        Example:
+            $ flask create:resource User --use-bulk
+            POSTing [{...}, {...}] returns the ids of the created records.
+        """,
+    )
+    flask_cli.add_argument(
+        "create:resource",
+        "--filter",
+        type=str,
+        nargs="+",
+        help="""
+        Specify the columns the resource is filtered or sorted on. Each value gets an index in the
+        model unless an existing index covers it, join columns with a comma for a composite index.
+        The --param of --use-single and the --cursor-key of --use-cursor are indexed as well.
+
+        Example:
+            $ flask create:resource User --filter status country,created_at
+            Indexes status and (country, created_at) of the User model.
+        """,
+    )
     flask_cli.add_argument(
         "create:resource",
         "--param",
@@ -533,6 +789,31 @@ def main():
         nargs=argparse.REMAINDER,
     )
 
+    flask_cli.create_command(
+        "report:indexes",
+        """
+        List the filtered and sorted columns recorded by --filter, --param and --cursor-key
+        in __filters__ of the models that no primary key, unique constraint or index supports.
+
+        Example:
+            $ flask report:indexes --database
+            Lists the filtered columns without an index in the database of DATABASE_URL.
+        """,
+    )
+    flask_cli.add_argument(
+        "report:indexes",
+        "--database",
+        action="store_true",
+        help="""
+        Compare against the indexes of the database configured by DATABASE_URL instead of the
+        indexes declared in the models, e.g. to find index revisions that were not applied.
+
+        Example:
+            $ flask report:indexes --database
+            Inspects the indexes of the database.
+        """,
+    )
+
     # Parse arguments and execute the appropriate command
     flask_cli.init()
 
@@ -15,7 +15,15 @@ class AssignmentModifier(ast.NodeTransformer):
             # `ast.parse` with mode='eval' to handle expressions
             node = ast.parse(value_str, mode="eval").body
             if not isinstance(
-                node, (ast.Expression, ast.Attribute, ast.Name, ast.Dict, ast.Call)
+                node,
+                (
+                    ast.Expression,
+                    ast.Attribute,
+                    ast.Name,
+                    ast.Dict,
+                    ast.Call,
+                    ast.Constant,
+                ),
             ):
                 raise ValueError("Invalid new value format")
             return node
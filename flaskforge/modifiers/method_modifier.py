@@ -13,12 +13,15 @@ class MethodModifier(ast.NodeTransformer):
             # Parse the new method source to an AST node
             new_method_tree = ast.parse(self.new_method_source).body[0]
             # Check if the new method is a function definition
-            if isinstance(new_method_tree, ast.FunctionDef):
+            if isinstance(new_method_tree, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 # Replace existing method or add new method
                 method_name = new_method_tree.name
                 method_exists = False
                 for i, item in enumerate(node.body):
-                    if isinstance(item, ast.FunctionDef) and item.name == method_name:
+                    if (
+                        isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                        and item.name == method_name
+                    ):
                         node.body[i] = new_method_tree
                         method_exists = True
                         break
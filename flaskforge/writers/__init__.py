@@ -9,6 +9,7 @@ from .swagger_writer import SwaggerWriter
 from .relationship_writer import RelationshipWriter
 from .helper_writer import HelperWriter
 from .migration_writer import MigrationWriter
+from .index_writer import IndexWriter
 
 __all__ = [
     "AppWriter",
@@ -21,5 +22,6 @@ __all__ = [
     "SwaggerWriter",
     "HelperWriter",
     "MigrationWriter",
+    "IndexWriter",
     "RelationshipWriter",
 ]
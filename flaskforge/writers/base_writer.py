@@ -76,6 +76,15 @@ class AbstractWriter(ABC):
         """
         return hasattr(self.args, "model_only") and self.args.model_only
 
+    def is_async(self) -> bool:
+        """
+        Check if the project was initialized with `initapp --async`.
+
+        Returns:
+            bool: True once the project has an asgi.py entry point.
+        """
+        return os.path.isfile(join_path(self.project_root, "asgi.py"))
+
     def write_source(self):
         """
         Write the source files to the writable path.
@@ -107,23 +116,21 @@ class AbstractWriter(ABC):
                 with open(base_path, "r") as reader:
                     base_model = reader.read()
 
-                if (
-                    hasattr(self.args, "use_docker")
-                    and not self.args.use_docker
-                    and self.type == "model"
+                if self.type == "model" and (
+                    not self.args.use_docker or self.is_async()
                 ):
-                    engine_source = """create_engine(
-                    environ.get("DATABASE_URL", "sqlite:///storage.db"))"""
-
-                    session_source = """scoped_session(
-                    sessionmaker(bind=engine,query_cls=BaseQuery))"""
                     tree = ast.parse(base_model)
-                    tree = AssignmentModifier("engine", engine_source.strip()).visit(
-                        tree
-                    )
-                    tree = AssignmentModifier("session", session_source.strip()).visit(
-                        tree
-                    )
+
+                    if not self.args.use_docker:
+                        engine_source = """build_engine(
+                        environ.get("DATABASE_URL", "sqlite:///storage.db"))"""
+                        tree = AssignmentModifier(
+                            "engine", engine_source.strip()
+                        ).visit(tree)
+
+                    if self.is_async():
+                        tree = AssignmentModifier("USE_ASYNC", "True").visit(tree)
+
                     base_model = astor.to_source(tree)
 
                 self.write(
@@ -131,6 +138,17 @@ class AbstractWriter(ABC):
                     self.format(base_model),
                 )
 
+            # async projects extend the base file with its async variant
+            base_async_path = join_path(
+                self.package_root, "bases", f"base_async_{self.type}.py"
+            )
+
+            if self.is_async() and os.path.isfile(base_async_path):
+                self.write(
+                    join_path(self.writable_path, f"base_async_{self.type}.py"),
+                    self.format(self.read(base_async_path)),
+                )
+
             # raise Exception
 
         # Write the main source file
@@ -72,6 +72,10 @@ pg_data
 
             # write docker file
             dockerfile = self.read(join_path(self.package_root, "bases", "Dockerfile"))
+            if getattr(self.args, "use_async", False):
+                dockerfile = dockerfile.replace(
+                    "pip install flaskforge", 'pip install "flaskforge[async]"'
+                )
             self.write(join_path(self.project_path, "Dockerfile"), dockerfile)
 
             # write docker-compose
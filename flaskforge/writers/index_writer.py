@@ -0,0 +1,237 @@
+import ast
+import astor
+from stringcase import snakecase
+
+from flaskforge.modifiers import ImportModifier, FieldModifier
+from flaskforge.utils.commons import join_path
+
+from .base_writer import AbstractWriter
+
+
+class IndexWriter(AbstractWriter):
+    """
+    A writer recording the filtered and sorted columns of a model and emitting
+    the indexes supporting them.
+
+    The columns are stored in `__filters__` of the model and every column group
+    that is not already covered by the primary key, an indexed column or the
+    leading columns of an existing index gets an `Index` in `__table_args__`.
+
+    Attributes:
+        type (str): The type of writer, set to "index".
+        tablename (str): The table of the model.
+        indexes (list): The (name, columns) of the indexes added to the model.
+    """
+
+    type = "index"
+
+    # columns of BaseModel and their indexes
+    base_columns = {"id": True, "created_at": True, "updated_at": True}
+
+    def __init__(self, args: object, **kwargs) -> None:
+        """
+        Initialize the IndexWriter with model-specific details.
+
+        Args:
+            args (object): Arguments object containing model details.
+            **kwargs: Additional keyword arguments (unused).
+        """
+        self.args = args
+        self.kwargs = kwargs
+        self.model = snakecase(self.args.model)
+        self.tablename = self.model
+        self.indexes = []
+        self.model_path = join_path(
+            self.project_root, "models", f"{self.model}_model.py"
+        )
+
+    def get_filters(self) -> list:
+        """
+        Collect the column groups the generated resource filters or sorts on.
+
+        Returns:
+            list: Tuples of column names, one per index candidate.
+        """
+        filters = [
+            tuple(snakecase(c.strip()) for c in f.split(",") if c.strip())
+            for f in (getattr(self.args, "filter", None) or [])
+        ]
+
+        if getattr(self.args, "use_single", False) and getattr(
+            self.args, "param", None
+        ):
+            filters.append((snakecase(self.args.param),))
+
+        # keyset pagination seeks and sorts on (key, id)
+        if getattr(self.args, "use_cursor", False):
+            key = snakecase(getattr(self.args, "cursor_key", None) or "id")
+            filters.append((key, "id") if key != "id" else (key,))
+
+        return list(dict.fromkeys(f for f in filters if f))
+
+    def read_model(self) -> tuple:
+        """
+        Read the columns, recorded filters and table arguments of the model.
+
+        Returns:
+            tuple: The AST, a dict column -> indexed, the recorded filters, the
+            existing table arguments and their trailing keyword dict.
+        """
+        tree = ast.parse(self.read(self.model_path))
+
+        columns, filters, table_args, table_kwargs = (
+            dict(self.base_columns),
+            [],
+            [],
+            None,
+        )
+
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Assign) or not isinstance(
+                node.targets[0], ast.Name
+            ):
+                continue
+
+            name = node.targets[0].id
+
+            if name == "__tablename__" and isinstance(node.value, ast.Constant):
+                self.tablename = node.value.value
+
+            elif name == "__filters__":
+                filters = [tuple(f) for f in ast.literal_eval(node.value)]
+
+            elif name == "__table_args__":
+                elts = (
+                    list(node.value.elts)
+                    if isinstance(node.value, ast.Tuple)
+                    else [node.value]
+                )
+                if elts and isinstance(elts[-1], ast.Dict):
+                    table_kwargs = elts.pop()
+                table_args = elts
+
+            elif (
+                isinstance(node.value, ast.Call)
+                and getattr(node.value.func, "id", None) == "Column"
+            ):
+                columns[name] = any(
+                    kw.arg in ("index", "primary_key", "unique")
+                    and isinstance(kw.value, ast.Constant)
+                    and kw.value.value is True
+                    for kw in node.value.keywords
+                )
+
+        return tree, columns, filters, table_args, table_kwargs
+
+    def get_index_columns(self, table_args: list) -> list:
+        """
+        Get the columns of the `Index` entries of the table arguments.
+
+        Args:
+            table_args (list): The AST nodes of `__table_args__`.
+
+        Returns:
+            list: Tuples of the indexed column names.
+        """
+        return [
+            tuple(
+                arg.value
+                for arg in node.args[1:]
+                if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+            )
+            for node in table_args
+            if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "Index"
+        ]
+
+    def is_covered(self, columns: tuple, indexed: dict, indexes: list) -> bool:
+        """
+        Check whether an existing index can serve a filter on the given columns.
+
+        Args:
+            columns (tuple): The filtered column group.
+            indexed (dict): Column name -> whether the column itself is indexed.
+            indexes (list): The columns of the composite indexes.
+
+        Returns:
+            bool: True if the primary key, an indexed column or the leading
+            columns of an index cover the group.
+        """
+        if columns[0] == "id" or (len(columns) == 1 and indexed.get(columns[0])):
+            return True
+
+        return any(index[: len(columns)] == columns for index in indexes)
+
+    def get_source(self) -> str:
+        """
+        Generate the model source recording the filters and their indexes.
+
+        Returns:
+            str: The formatted source code of the model.
+
+        Raises:
+            AttributeError: If a filtered column is not a column of the model.
+        """
+        tree, indexed, recorded, table_args, table_kwargs = self.read_model()
+        filters = self.get_filters()
+
+        unknown = [c for f in filters for c in f if c not in indexed]
+        if unknown:
+            raise AttributeError(
+                f"Unknown column(s) {', '.join(unknown)} in filters of {self.model}"
+            )
+
+        indexes = self.get_index_columns(table_args)
+        sources = [astor.to_source(node).strip() for node in table_args]
+
+        for columns in filters:
+            # a longer group starting with the same columns serves both
+            if self.is_covered(columns, indexed, indexes) or any(
+                len(other) > len(columns) and other[: len(columns)] == columns
+                for other in filters
+            ):
+                continue
+
+            name = f"ix_{self.tablename}_{'_'.join(columns)}"
+            sources.append(
+                f"""Index("{name}", {", ".join(f'"{c}"' for c in columns)})"""
+            )
+            indexes.append(columns)
+            self.indexes.append((name, columns))
+
+        # astor drops the parentheses of tuples, the values are filled in as text
+        values = {}
+
+        filters = list(dict.fromkeys(recorded + filters))
+        if filters:
+            values["__FILTERS__"] = repr(tuple(filters))
+            tree = FieldModifier("__filters__ = __FILTERS__").visit(tree)
+
+        if self.indexes:
+            if table_kwargs is not None:
+                sources.append(astor.to_source(table_kwargs).strip())
+
+            values["__TABLE_ARGS__"] = f"({', '.join(sources)},)"
+            tree = FieldModifier("__table_args__ = __TABLE_ARGS__").visit(tree)
+            tree = ImportModifier(["Index"], extend=True, module="sqlalchemy").visit(
+                tree
+            )
+
+        source = astor.to_source(tree)
+        for placeholder, value in values.items():
+            source = source.replace(placeholder, value)
+
+        return self.format(source)
+
+    def write_source(self):
+        """
+        Write the filters and indexes to the model file.
+
+        Returns:
+            list: The (name, columns) of the indexes added to the model.
+        """
+        if not self.get_filters():
+            return self.indexes
+
+        self.write(self.model_path, self.get_source())
+
+        return self.indexes
@@ -1,8 +1,12 @@
 import re
 import ast
 import astor
+from glob import glob
+from uuid import uuid4
 from os import getenv, path
 
+from stringcase import snakecase
+
 from yaml import load, Loader
 from dotenv import load_dotenv
 from flaskforge.utils.commons import join_path
@@ -51,7 +55,7 @@ class MigrationWriter(AbstractWriter):
 
         tree = AssignmentModifier("target_metadata", "Base.metadata").visit(tree)
 
-        self.env_py = self.format(astor.to_source(tree))
+        self.env_py = self.add_include_name(self.format(astor.to_source(tree)))
 
         if (
             hasattr(self.args, "use_docker")
@@ -81,3 +85,285 @@ class MigrationWriter(AbstractWriter):
 
         # Replace the existing sqlalchemy.url line with the new one
         self.alembic_ini = re.sub(pattern, replacement, alembic_ini, flags=re.MULTILINE)
+
+    def add_include_name(self, env_py: str) -> str:
+        """
+        Keep autogenerate away from the search tables, columns and indexes which
+        are managed by their own revisions.
+
+        Args:
+            env_py (str): The source of migration/env.py.
+
+        Returns:
+            str: The source with an include_name hook passed to context.configure.
+        """
+        if "include_name" in env_py:
+            return env_py
+
+        hook = """
+
+def include_name(name, type_, parent_names):
+    return not (name or "").startswith("search_")
+
+"""
+        env_py = re.sub(
+            r"^target_metadata\s*=.*$",
+            lambda m: m.group(0) + hook,
+            env_py,
+            count=1,
+            flags=re.MULTILINE,
+        )
+
+        return self.format(
+            env_py.replace(
+                "target_metadata=target_metadata",
+                "target_metadata=target_metadata, include_name=include_name",
+            )
+        )
+
+    def get_head(self) -> str:
+        """
+        Get the head revision of migration/versions.
+
+        Returns:
+            str: The revision no other revision revises, None without revisions.
+        """
+        revisions, revised = [], set()
+
+        for version in glob(join_path(self.migration_path, "versions", "*.py")):
+            source = self.read_source(version)
+
+            revision = re.search(
+                r"^revision(?:\s*:\s*str)?\s*=\s*['\"](\w+)['\"]", source, re.MULTILINE
+            )
+            down_revision = re.search(
+                r"^down_revision[^=]*=\s*(.*)$", source, re.MULTILINE
+            )
+
+            if revision:
+                revisions.append(revision.group(1))
+            if down_revision:
+                revised.update(re.findall(r"['\"](\w+)['\"]", down_revision.group(1)))
+
+        heads = [r for r in revisions if r not in revised]
+
+        return heads[0] if heads else None
+
+    def get_text_columns(self) -> tuple:
+        """
+        Read the table name and text columns of the model from its source.
+
+        Returns:
+            tuple: The table name and the names of String/Text columns.
+        """
+        model_path = join_path(
+            self.project_root, "models", f"{snakecase(self.args.model)}_model.py"
+        )
+        tree = ast.parse(self.read_source(model_path))
+
+        tablename, columns = snakecase(self.args.model), []
+
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Assign) or not isinstance(
+                node.targets[0], ast.Name
+            ):
+                continue
+
+            name = node.targets[0].id
+            if name == "__tablename__" and isinstance(node.value, ast.Constant):
+                tablename = node.value.value
+                continue
+
+            if not (
+                isinstance(node.value, ast.Call)
+                and getattr(node.value.func, "id", None) == "Column"
+            ):
+                continue
+
+            types = [
+                getattr(arg.func if isinstance(arg, ast.Call) else arg, "id", None)
+                for arg in node.value.args
+            ]
+            if set(types) & {"String", "Text", "Unicode", "UnicodeText"}:
+                columns.append(name)
+
+        return tablename, columns
+
+    def get_search_ddl(self, tablename: str, columns: list) -> tuple:
+        """
+        Generate the DDL creating and dropping the search index of a table.
+
+        Args:
+            tablename (str): The table to index.
+            columns (list): The text columns to index.
+
+        Returns:
+            tuple: The upgrade and downgrade statements.
+        """
+        engine = self.args.search_engine
+        search = f"search_{tablename}"
+
+        if engine == "tsvector":
+            document = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+            return (
+                [
+                    f"ALTER TABLE {tablename} ADD COLUMN search_vector tsvector "
+                    f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED",
+                    f"CREATE INDEX {search}_vector ON {tablename} "
+                    "USING gin (search_vector)",
+                ],
+                [
+                    f"DROP INDEX IF EXISTS {search}_vector",
+                    f"ALTER TABLE {tablename} DROP COLUMN IF EXISTS search_vector",
+                ],
+            )
+
+        if engine == "trgm":
+            return (
+                ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+                + [
+                    f"CREATE INDEX {search}_{c} ON {tablename} USING gin ({c} gin_trgm_ops)"
+                    for c in columns
+                ],
+                [f"DROP INDEX IF EXISTS {search}_{c}" for c in columns],
+            )
+
+        names = ", ".join(columns)
+        new = ", ".join(f"new.{c}" for c in columns)
+        old = ", ".join(f"old.{c}" for c in columns)
+        insert = f"INSERT INTO {search}(rowid, {names}) VALUES (new.id, {new});"
+        delete = (
+            f"INSERT INTO {search}({search}, rowid, {names}) "
+            f"VALUES ('delete', old.id, {old});"
+        )
+
+        return (
+            [
+                f"CREATE VIRTUAL TABLE {search} USING fts5({names}, "
+                f"content='{tablename}', content_rowid='id')",
+                f"INSERT INTO {search}({search}) VALUES ('rebuild')",
+                f"CREATE TRIGGER {search}_ai AFTER INSERT ON {tablename} "
+                f"BEGIN {insert} END",
+                f"CREATE TRIGGER {search}_ad AFTER DELETE ON {tablename} "
+                f"BEGIN {delete} END",
+                f"CREATE TRIGGER {search}_au AFTER UPDATE ON {tablename} "
+                f"BEGIN {delete} {insert} END",
+            ],
+            [
+                f"DROP TRIGGER IF EXISTS {search}_ai",
+                f"DROP TRIGGER IF EXISTS {search}_ad",
+                f"DROP TRIGGER IF EXISTS {search}_au",
+                f"DROP TABLE IF EXISTS {search}",
+            ],
+        )
+
+    def write_search_revision(self):
+        """
+        Write an alembic revision creating the search index of the model on top
+        of the current head, and hook autogenerate so it leaves the index alone.
+
+        TODO:
+            - Handle projects with several heads.
+        """
+        tablename, columns = self.get_text_columns()
+        if not columns:
+            return None
+
+        upgrade, downgrade = self.get_search_ddl(tablename, columns)
+        revision = uuid4().hex[:12]
+        down_revision = self.get_head()
+
+        upgrade_source = "".join(f"    op.execute({sql!r})\n" for sql in upgrade)
+        downgrade_source = "".join(f"    op.execute({sql!r})\n" for sql in downgrade)
+
+        source = f'''"""{self.args.search_engine} search index for {tablename}
+
+Revision ID: {revision}
+Revises: {down_revision}
+"""
+from alembic import op
+
+
+revision = "{revision}"
+down_revision = {down_revision!r}
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+{upgrade_source}
+
+def downgrade():
+{downgrade_source}
+'''
+
+        self.write(
+            join_path(
+                self.migration_path,
+                "versions",
+                f"{revision}_search_{tablename}.py",
+            ),
+            self.format(source),
+        )
+
+        self.write(
+            self.env_py_path,
+            self.add_include_name(self.read_source(self.env_py_path)),
+        )
+
+    def write_index_revision(self, tablename: str, indexes: list):
+        """
+        Write an alembic revision creating the indexes of filtered columns on
+        top of the current head.
+
+        Args:
+            tablename (str): The indexed table.
+            indexes (list): The (name, columns) of the indexes to create.
+
+        TODO:
+            - Handle projects with several heads.
+        """
+        if not indexes:
+            return None
+
+        revision = uuid4().hex[:12]
+        down_revision = self.get_head()
+
+        upgrade_source = "".join(
+            f"    op.create_index({name!r}, {tablename!r}, {list(columns)!r})\n"
+            for name, columns in indexes
+        )
+        downgrade_source = "".join(
+            f"    op.drop_index({name!r}, table_name={tablename!r})\n"
+            for name, _ in reversed(indexes)
+        )
+
+        source = f'''"""filter indexes for {tablename}
+
+Revision ID: {revision}
+Revises: {down_revision}
+"""
+from alembic import op
+
+
+revision = "{revision}"
+down_revision = {down_revision!r}
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+{upgrade_source}
+
+def downgrade():
+{downgrade_source}
+'''
+
+        self.write(
+            join_path(
+                self.migration_path,
+                "versions",
+                f"{revision}_index_{tablename}.py",
+            ),
+            self.format(source),
+        )
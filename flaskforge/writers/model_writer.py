@@ -1,4 +1,4 @@
-from stringcase import pascalcase
+from stringcase import pascalcase, snakecase
 from .base_writer import AbstractWriter
 
 
@@ -61,11 +61,12 @@ class ModelWriter(AbstractWriter):
             )
         )
 
-        # Import statement for base model
-        source_relate_import = "from .base_model import BaseModel"
+        # Import statement for base model, async projects await its queries
+        base = "BaseAsyncModel" if self.is_async() else "BaseModel"
+        source_relate_import = f"from .{snakecase(base)} import {base}"
 
         # Class definition and table name
-        source_class = f"class {self.classname}(BaseModel):\n"
+        source_class = f"class {self.classname}({base}):\n"
         source_table_name = f"\t__tablename__ = '{self.model}'\n\n"
 
         # Field attributes
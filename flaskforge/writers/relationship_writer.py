@@ -234,10 +234,20 @@ def validate_{field_name}(self, key, {field_name}):
         return f"""{field} = relationship("{
             pascalcase(self.child if model is None else model)}", backref="{
                 self.model if backref is None else backref
-                }", uselist={uselist}{
+                }", uselist={uselist}{self.get_loader_str()}{
                     ')' if self.is_use_child_backref else ',cascade="all, delete-orphan")'
                     }"""
 
+    def get_loader_str(self) -> str:
+        """
+        Generate the loader hint read by BaseModel when eager loading nested fields.
+
+        Returns:
+            str: The info keyword argument, or an empty string when no loader is pinned.
+        """
+        loader = getattr(self.args, "loader", None)
+        return f', info={{"loader": "{loader}"}}' if loader else ""
+
     def get_foriegn_key_str(
         self,
         model: str = None,
@@ -477,7 +487,7 @@ class {classname}(Base):
         field_name = p.plural(snakecase(self.child.replace("Model", "")))
 
         field_source = f"""{field_name} = relationship("{self.child}", secondary="{
-            self.secondary_name}",backref="{p.plural(self.model)}")"""
+            self.secondary_name}",backref="{p.plural(self.model)}"{self.get_loader_str()})"""
 
         tree = ast.parse(self.get_parent_source(field_name))
         tree = FieldModifier(field_source).visit(tree)
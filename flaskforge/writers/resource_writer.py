@@ -74,6 +74,106 @@ class ResourceWriter(AbstractWriter):
 
         self.set_writable_path("resources")
 
+    def get_cursor_key(self) -> str:
+        """
+        Get the sort key used for cursor pagination.
+
+        Returns:
+            str: The sort column when `--use-cursor` is flagged, otherwise None.
+        """
+        if not (hasattr(self.args, "use_cursor") and self.args.use_cursor):
+            return None
+
+        return snakecase(getattr(self.args, "cursor_key", None) or "id")
+
+    def get_cache_ttl(self):
+        """
+        Get the lifetime of the cached reads of the resource.
+
+        Returns:
+            The `--cache-ttl` seconds, True for QUERY_CACHE_TTL when only `--use-cache`
+            is flagged, otherwise None.
+        """
+        if not getattr(self.args, "use_cache", False):
+            return None
+
+        return getattr(self.args, "cache_ttl", None) or True
+
+    def get_conditional_source(self, method: str) -> str:
+        """
+        Generate the decorator answering conditional GETs with 304.
+
+        Single record handlers also answer If-Modified-Since, lists only
+        If-None-Match.
+
+        Args:
+            method (str): The HTTP method of the generated handler.
+
+        Returns:
+            str: The `conditional` decorator followed by a comma for GET, otherwise
+            an empty string.
+        """
+        if method != "get":
+            return ""
+
+        model = pascalcase(f"{self.model}_model")
+        options = {"search": ", search=True", "get": ", single=True"}
+
+        return f"conditional({model}{options.get(self.mapped_method['get'], '')}),"
+
+    def is_use_bulk(self) -> bool:
+        """
+        Check whether POST accepts a JSON array of records.
+
+        Returns:
+            bool: True when `--use-bulk` is flagged.
+        """
+        return bool(getattr(self.args, "use_bulk", False))
+
+    def get_bulk_source(self, method: str) -> str:
+        """
+        Generate the branches writing many records at once.
+
+        POST inserts a JSON array, PUT/PATCH update a JSON array by id or every
+        record matching the query string, DELETE removes every matching record.
+
+        Args:
+            method (str): The HTTP method of the generated handler.
+
+        Returns:
+            str: The bulk branches of the method, or an empty string.
+        """
+        if not self.is_use_bulk() or method == "get":
+            return ""
+
+        await_ = "await " if self.is_async() else ""
+
+        if method == "post":
+            return f"""
+        if isinstance(schema, list):
+            ids = {await_}self.model.bulk_add(schema)
+            return make_response({{"ids": ids, "totalRecords": len(schema)}}, 201)
+"""
+
+        if method == "delete":
+            return f"""
+        if expression:
+            model = self.model()
+            total = {await_}model.delete_where(expression)
+            return make_response({{"affectedRecords": total}}, 200)
+"""
+
+        return f"""
+        if isinstance(schema, list):
+            total = {await_}self.model.bulk_update(schema)
+            return make_response({{"affectedRecords": total}}, 200)
+
+        if expression:
+            model = self.model()
+            total = {await_}model.update_where(expression, schema)
+            return make_response({{"affectedRecords": total}}, 200)
+"""
+
     def write_source(self):
         """
         Write the generated resource source code to the appropriate file.
@@ -100,6 +200,10 @@ class ResourceWriter(AbstractWriter):
 
         p = engine()
 
+        # async projects await the model queries in async handlers
+        base = "BaseAsyncResource" if self.is_async() else "BaseResource"
+        async_, await_ = ("async ", "await ") if self.is_async() else ("", "")
+
         endpoint = route = p.plural(
             self.args.name if self.args.name is not None else self.args.model
         )
@@ -107,40 +211,46 @@ class ResourceWriter(AbstractWriter):
         source_import = f"""
 from flask import make_response
 
-from utils.helper import validator, authenticate
+from utils.helper import validator, authenticate, conditional
 from schemas import {pascalcase(f"{self.model}_schema")}
 from models import {pascalcase(f"{self.model}_model")}
-from .base_resource import BaseResource
+from .{snakecase(base)} import {base}
 """
 
         source_decorator = [
-            f""""{method}": [validator({pascalcase(f"{self.model}_schema")
+            f""""{method}": [{self.get_conditional_source(method)}validator({pascalcase(f"{self.model}_schema")
             }{",partial=True" if method in ["get", "patch"] else ""
-              }{",exclude=('id',)" if method == "post" else ""}){",authenticate"}]"""
+              }{",exclude=('id',)" if method == "post" else ""
+                }{",bulk=True" if method != "get" and self.is_use_bulk() else ""}){",authenticate"}]"""
             for method in self.model_methods
         ]
 
         source_class = f"""
-class {self.classname}(BaseResource):
+class {self.classname}({base}):
     __endpoint__ = "{endpoint}"
     __blueprint__ = "{route}_route"
 
     model = {pascalcase(f"{self.model}_model")}
     model.Schema_ = {pascalcase(f"{self.model}_schema")}
+    {f'model.__cursor__ = "{self.get_cursor_key()}"' if self.get_cursor_key() else ""}
+    {f'model.__count__ = "{self.args.count_strategy}"' if getattr(self.args, "count_strategy", None) else ""}
+    {f'model.__search__ = "{self.args.search_engine}"' if getattr(self.args, "search_engine", None) else ""}
+    {f'model.__cache__ = {self.get_cache_ttl()}' if self.get_cache_ttl() else ""}
 
     method_decorators = {{{",".join(source_decorator)}}}
 """
         source_methods = [
             f"""
-    def {method}(self, {
+    {async_}def {method}(self, {
                 "expression: dict = dict(), pagination: dict = dict()"
                 if method == "get" else "schema: dict = dict()"
-            }):
+            }{", expression: dict = dict()" if method not in ("get", "post") and self.is_use_bulk() else ""}):
 
+{self.get_bulk_source(method)}
         model = self.model({"schema" if method != "get" else ""})
-        model.{self.mapped_method[method]}({f"{'expression, pagination' if hasattr(self.args, 'use_single') and not self.args.use_single else 'expression'}" if method == "get" else ""})
+        {await_}model.{self.mapped_method[method]}({"expression, pagination" if method == "get" else ""})
         
-        return make_response(model.jsonify(), {
+        return make_response({await_}model.jsonify(), {
             200 if method not in ["post", "delete"] else (201 if method == "post" else 204)
             })
 """
@@ -18,6 +18,7 @@ class RunnerWriter(AbstractWriter):
         project (str): The name of the project.
         runner (str): Path to the runner script.
         base_runner (str): Path to the base runner script template.
+        asgi (str): Path to the ASGI entry point of async projects.
     """
 
     type = "runner"
@@ -38,7 +39,21 @@ class RunnerWriter(AbstractWriter):
         self.project = self.args.project
 
         self.runner = join_path(self.project_root, self.project, "runner.py")
-        self.base_runner = join_path(self.package_root, "bases", "base_runner.py")
+        self.asgi = join_path(self.project_root, self.project, "asgi.py")
+        self.base_runner = join_path(
+            self.package_root,
+            "bases",
+            "base_async_runner.py" if self.is_use_async() else "base_runner.py",
+        )
+
+    def is_use_async(self) -> bool:
+        """
+        Check if the project is initialized with `--async`.
+
+        Returns:
+            bool: True when the runner serves the app through asgi.py.
+        """
+        return bool(getattr(self.args, "use_async", False))
 
     def validate_project(self, project: str) -> str:
         """
@@ -75,6 +90,15 @@ class RunnerWriter(AbstractWriter):
 
         self.write(self.runner, self.get_source())
 
+        # writers detect async projects by their ASGI entry point
+        if self.is_use_async():
+            self.write(
+                self.asgi,
+                self.format(
+                    self.read(join_path(self.package_root, "bases", "base_asgi.py"))
+                ),
+            )
+
     def get_source(self) -> str:
         """
         Read and format the source code from the base runner template.
@@ -10,6 +10,7 @@ from flaskforge.writers import (
     RelationshipWriter,
     HelperWriter,
     MigrationWriter,
+    IndexWriter,
 )
 
 
@@ -37,6 +38,7 @@ class WriterFactory:
         "relationship": RelationshipWriter,
         "helper": HelperWriter,
         "migration": MigrationWriter,
+        "index": IndexWriter,
     }
 
     def __new__(cls, factory: str, args: object, **kwargs):
@@ -38,6 +38,22 @@ setup(
             "pytest",  # Testing framework
             "sphinx",  # Documentation generator
         ],
+        "redis": [
+            "redis",  # shared backend of the query result cache
+        ],
+        "orjson": [
+            "orjson",  # JSON provider of the generated app
+        ],
+        "compression": [
+            "brotli",  # br response and request encoding
+            "zstandard",  # zstd response and request encoding
+        ],
+        "async": [
+            "asgiref",  # ASGI adapter of the generated app
+            "uvicorn",  # ASGI server
+            "asyncpg",  # PostgreSQL asyncio driver
+            "aiosqlite",  # SQLite asyncio driver
+        ],
     },
     entry_points={
         "console_scripts": [
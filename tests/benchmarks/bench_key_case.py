@@ -0,0 +1,72 @@
+"""Benchmark the key tables of BaseSchema against the per-call stringcase path.
+
+Translates query strings with flattened nested keys, as GET validates them,
+and the dumped records to camelCase:
+
+    python tests/benchmarks/bench_key_case.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate import generate_project  # noqa: E402
+from test_key_case import reference_camelcase, reference_snakecase  # noqa: E402
+
+NUMBER = 20000
+REPEAT = 5
+
+
+def main() -> None:
+    warnings.filterwarnings("ignore")
+    generate_project(tempfile.mkdtemp())
+
+    from flask import Flask
+    from schemas import CommentSchema
+
+    schema = CommentSchema(context={"query": True})
+    query = {
+        "body": "x",
+        "createdAt": "2024-01-01",
+        "postsTitle": "t",
+        "postsId": "2",
+        "page": "1",
+        "perPage": "20",
+    }
+    record = {"id": 1, "body": "x", "created_at": None, "updated_at": None}
+
+    cases = {
+        "to_snakecase": (query, schema.to_snakecase, reference_snakecase),
+        "to_camelcase": (record, schema.to_camelcase, reference_camelcase),
+    }
+
+    with Flask(__name__).test_request_context(method="GET"):
+        for name, (data, translate, reference) in cases.items():
+            assert translate(dict(data)) == reference(schema, dict(data))
+
+            old = min(
+                timeit.repeat(
+                    lambda: reference(schema, dict(data)),
+                    number=NUMBER,
+                    repeat=REPEAT,
+                )
+            )
+            new = min(
+                timeit.repeat(
+                    lambda: translate(dict(data)), number=NUMBER, repeat=REPEAT
+                )
+            )
+
+            old, new = old / NUMBER * 1e6, new / NUMBER * 1e6
+            print(
+                f"{name}  stringcase {old:6.2f} us  key tables {new:6.2f} us"
+                f"  x{old / new:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
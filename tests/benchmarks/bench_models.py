@@ -0,0 +1,195 @@
+"""Benchmark model instantiation and get_query on a generated project against
+the baseline walking class_mapper(cls).attrs on every call.
+
+reference_init and reference_get_query are the paths the mapper metadata
+cached in Model.__mapping__ replaced, both run in the same process:
+
+    python tests/benchmarks/bench_models.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import warnings
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate import generate_project  # noqa: E402
+from sqlalchemy.orm import (  # noqa: E402
+    ColumnProperty,
+    RelationshipProperty,
+    class_mapper,
+)
+
+NUMBER = 5000
+REPEAT = 15
+
+
+def reference_init(self, schema: dict = {}):
+    from models.base_model import session
+
+    self.schema = schema
+    self._session = session
+    self.mapper = class_mapper(self.__class__)
+
+    for attr in self.mapper.attrs:
+        # skip none sqlalchemy attributes
+        if not isinstance(attr, (RelationshipProperty, ColumnProperty)):
+            continue
+
+        if isinstance(attr, ColumnProperty):
+            column = attr.columns[0].name
+            if self.schema.get(column):
+                setattr(self, column, self.schema[column])
+            continue
+
+        if not self.schema.get(attr.key):
+            continue
+
+        if self.id is not None and f"{self.__class__.__tablename__}_id" not in [
+            f.key
+            for f in attr.mapper.attrs
+            if isinstance(f, ColumnProperty) and f.columns[0].foreign_keys
+        ]:
+            continue
+
+        child_model = attr.mapper.class_
+
+        child = (
+            [child_model(c) for c in self.schema[attr.key]]
+            if attr.uselist
+            else child_model(self.schema[attr.key])
+        )
+
+        setattr(self, attr.key, child)
+
+
+def reference_get_query(self, expression: dict, **kwargs):
+    from models.base_model import get_fieldset_options
+
+    q = self._session.query(self.__class__)
+
+    if kwargs.get("fields"):
+        q = q.options(
+            *get_fieldset_options(
+                self.mapper,
+                self.Schema_(),
+                kwargs["fields"] + ((self.__cursor__,) if self.__cursor__ else ()),
+            )
+        )
+    elif kwargs.get("load", True):
+        q = q.options(*self.loader_options())
+
+    for attr in self.mapper.attrs:
+        if not isinstance(attr, ColumnProperty):
+            continue
+
+        column = attr.columns[0]
+        if column.name not in expression.keys():
+            continue
+
+        q = (
+            q.filter(column.contains(expression.get(column.name)))
+            if kwargs.get("search") and issubclass(column.type.python_type, str)
+            else q.filter(column == expression.get(column.name))
+        )
+
+    for k, m in self.mapper.relationships.items():
+        if not expression.get(k):
+            continue
+
+        q = (
+            q.join(m.mapper.class_)
+            if m.secondary is None
+            else q.join(m.secondary).join(m.mapper.class_)
+        )
+
+        for attr in m.mapper.attrs:
+            if not isinstance(attr, ColumnProperty):
+                continue
+            column = attr.columns[0]
+
+            if column.name not in (
+                expression[k].keys()
+                if isinstance(expression[k], dict)
+                else expression[k][0].keys()
+            ):
+                continue
+
+            parameter = (
+                expression[k][0] if isinstance(expression[k], list) else expression[k]
+            )
+
+            q = (
+                q.filter(column.contains(parameter[column.name]))
+                if kwargs.get("search") and isinstance(column.type.python_type, str)
+                else q.filter(column == parameter[column.name])
+            )
+
+    return q
+
+
+@contextmanager
+def reference_models(*models):
+    """construct the models with reference_init, the instrumented __init__
+    SQLAlchemy generates calls the original_init of the class manager
+    """
+    managers = [class_mapper(model).class_manager for model in models]
+    originals = [manager.original_init for manager in managers]
+
+    for manager in managers:
+        manager.original_init = reference_init
+
+    try:
+        yield
+    finally:
+        for manager, original in zip(managers, originals):
+            manager.original_init = original
+
+
+def main() -> None:
+    warnings.filterwarnings("ignore")
+    generate_project(tempfile.mkdtemp())
+
+    from models import CommentModel, PostModel
+    from schemas import CommentSchema
+
+    CommentModel.Schema_ = CommentSchema
+    model = CommentModel()
+    record = {"body": "x", "id": 3, "posts": [{"id": 1, "title": "t"}]}
+    expression = {"body": "x", "posts": [{"title": "t"}]}
+
+    # every case takes the get_query it runs, the models pick their __init__
+    cases = {
+        "CommentModel({})": lambda get_query: CommentModel(),
+        "CommentModel(body, id, 1 post)": lambda get_query: CommentModel(record),
+        "get_query({})": lambda get_query: get_query(model, {}, load=False),
+        "get_query(body, posts.title)": lambda get_query: get_query(
+            model, expression, load=False
+        ),
+    }
+
+    for name, case in cases.items():
+        with reference_models(CommentModel, PostModel):
+            old = min(
+                timeit.repeat(
+                    lambda: case(reference_get_query), number=NUMBER, repeat=REPEAT
+                )
+            )
+        new = min(
+            timeit.repeat(
+                lambda: case(CommentModel.get_query), number=NUMBER, repeat=REPEAT
+            )
+        )
+
+        old, new = old / NUMBER * 1e6, new / NUMBER * 1e6
+        print(
+            f"{name:32} mapper.attrs {old:8.2f} us  __mapping__ {new:8.2f} us"
+            f"  x{old / new:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
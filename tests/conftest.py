@@ -0,0 +1,74 @@
+"""Fixtures loading the app of a project generated with the flaskforge CLI."""
+
+import os
+
+import pytest
+
+from generate import generate_project
+
+
+@pytest.fixture(scope="session")
+def project(tmp_path_factory):
+    """path of the generated project, importable for the rest of the session"""
+    return generate_project(str(tmp_path_factory.mktemp("generated")), "--use-bulk")
+
+
+@pytest.fixture(scope="session")
+def app(project):
+    # conditional GETs are opt-in, test_conditional covers them
+    os.environ["CONDITIONAL_GET"] = "true"
+
+    import utils.helper
+
+    # resources are generated behind JWT authentication
+    utils.helper.verify_jwt_in_request = lambda *args, **kwargs: None
+
+    import runner
+    from models.base_model import Base, engine
+
+    Base.metadata.create_all(engine)
+
+    return runner.app
+
+
+@pytest.fixture
+def client(app):
+    from models.base_model import Base, engine
+
+    yield app.test_client()
+
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def seed(client):
+    """five comments, seven posts spread over the first three"""
+    from models import PostModel
+    from models.base_model import session
+
+    for i in range(5):
+        client.post("/comments", json={"body": f"c{i + 1}"})
+
+    for i in range(7):
+        session.add(PostModel({"title": f"p{i + 1}", "comment_id": 1 + i % 3}))
+
+    session.commit()
+    session.remove()
+
+
+@pytest.fixture
+def statements(app):
+    """list of the SQL statements executed while the test runs"""
+    from sqlalchemy import event
+    from models.base_model import engine
+
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,73 @@
+"""Generate a project with the flaskforge CLI for the tests and benchmarks.
+
+The templates in flaskforge/bases only run inside a generated project: a post
+model, a comment model with many posts and a user model signing in with
+create:authentication, which hashes its password in __setattr__.
+"""
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# answers to the prompts of "create post": a title column, no relationship
+POST_PROMPTS = "attr title\ntype string 50\nok\nyes\nno\nyes\nno\nno\n"
+
+# answers to the prompts of "create comment": a body column, many posts
+COMMENT_PROMPTS = "attr body\ntype string 200\nok\nyes\nno\nyes\n0\n2\nno\nno\nno\n"
+
+# answers to the prompts of "create user": username and password, no relationship
+USER_PROMPTS = (
+    "attr username\ntype string 50\nok\nyes\nyes\n"
+    "attr password\ntype string 100\nok\nyes\nno\nno\nyes\nno\nno\n"
+)
+
+
+def flaskforge(cwd: str, *args, prompts: str = "") -> None:
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT,
+        "GIT_AUTHOR_NAME": "flaskforge",
+        "GIT_AUTHOR_EMAIL": "flaskforge@localhost",
+        "GIT_COMMITTER_NAME": "flaskforge",
+        "GIT_COMMITTER_EMAIL": "flaskforge@localhost",
+    }
+
+    subprocess.run(
+        [sys.executable, "-m", "flaskforge.flask_cli_tool", *args],
+        cwd=cwd,
+        env=env,
+        input=prompts,
+        text=True,
+        capture_output=True,
+        check=True,
+    )
+
+
+def generate_project(root: str, *flags) -> str:
+    """generate the project in root/proj and make it importable
+    param   root    String  directory of the project and its SQLite database
+    param   flags   Tuple   options of "create", e.g. --use-bulk
+    return  path    String  path of the project
+    """
+    path = os.path.join(root, "proj")
+
+    flaskforge(root, "initapp", "proj")
+    flaskforge(path, "create", "post", "--force", *flags, prompts=POST_PROMPTS)
+    flaskforge(path, "create", "comment", "--force", *flags, prompts=COMMENT_PROMPTS)
+    flaskforge(path, "create", "user", "--force", *flags, prompts=USER_PROMPTS)
+    flaskforge(
+        path,
+        "create:authentication",
+        "user",
+        "--username-field",
+        "username",
+        "--password-field",
+        "password",
+    )
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(root, 'test.db')}"
+    sys.path.insert(0, path)
+
+    return path
@@ -0,0 +1,117 @@
+"""Writes of the user model generated by create:authentication, whose
+__setattr__ hashes the password, through the ORM and the statement paths.
+"""
+
+import pytest
+from bcrypt import checkpw
+
+
+def stored_passwords() -> list:
+    """passwords as stored in the database, not as the model loads them"""
+    from models import UserModel
+    from models.base_model import session
+
+    table = UserModel.__table__
+    passwords = session.execute(
+        table.select().with_only_columns(table.c.password).order_by(table.c.id)
+    ).scalars()
+
+    try:
+        return list(passwords)
+    finally:
+        session.remove()
+
+
+def assert_hashed(stored: str, password: str) -> None:
+    assert stored.startswith("$2b$")
+    assert checkpw(password.encode(), stored.encode())
+
+
+def test_patch_hashes_password(client):
+    user = client.post("/users", json={"username": "u", "password": "x"}).get_json()
+
+    response = client.patch("/users", json={"id": user["id"], "password": "y"})
+
+    assert response.status_code == 200
+    (stored,) = stored_passwords()
+    assert_hashed(stored, "y")
+    assert response.get_json()["password"] == stored
+
+
+def test_patch_response_keeps_nested_fields(client, seed):
+    response = client.patch("/comments", json={"id": 1, "body": "b"})
+
+    assert response.status_code == 200
+    assert response.get_json()["body"] == "b"
+    assert sorted(p["title"] for p in response.get_json()["posts"]) == [
+        "p1",
+        "p4",
+        "p7",
+    ]
+
+
+@pytest.fixture(scope="module")
+def label_model(app):
+    """model normalizing a column in a @validates hook"""
+    from sqlalchemy import Column, String
+    from sqlalchemy.orm import validates
+    from models.base_model import BaseModel, engine
+
+    class LabelModel(BaseModel):
+        __tablename__ = "label"
+        name = Column(String(50))
+
+        @validates("name")
+        def validate_name(self, key, name):
+            return name.strip().lower()
+
+    LabelModel.__table__.create(engine)
+
+    return LabelModel
+
+
+def test_bulk_post_hashes_passwords(client):
+    users = [{"username": f"u{i}", "password": f"x{i}"} for i in range(3)]
+
+    response = client.post("/users", json=users)
+
+    assert response.status_code == 201
+    assert len(response.get_json()["ids"]) == len(users)
+    for stored, user in zip(stored_passwords(), users):
+        assert_hashed(stored, user["password"])
+
+
+def test_bulk_add_runs_validators(client, label_model):
+    from models.base_model import session
+
+    ids = label_model.bulk_add([{"name": " One "}, {"name": "TWO"}])
+
+    names = session.query(label_model.name).order_by(label_model.id).all()
+    assert len(ids) == 2
+    assert [name for name, in names] == ["one", "two"]
+    session.remove()
+
+
+def test_bulk_patch_hashes_passwords(client):
+    users = [{"username": f"u{i}", "password": f"x{i}"} for i in range(3)]
+    ids = client.post("/users", json=users).get_json()["ids"]
+
+    response = client.patch(
+        "/users", json=[{"id": id_, "password": f"y{id_}"} for id_ in ids]
+    )
+
+    assert response.get_json() == {"affectedRecords": 3}
+    for stored, id_ in zip(stored_passwords(), ids):
+        assert_hashed(stored, f"y{id_}")
+
+
+def test_filtered_patch_hashes_password(client):
+    client.post("/users", json=[{"username": "a", "password": "x"}])
+    client.post("/users", json=[{"username": "b", "password": "x"}])
+
+    response = client.patch("/users?username=b", json={"password": "y"})
+
+    assert response.get_json() == {"affectedRecords": 1}
+    first, second = stored_passwords()
+    assert_hashed(first, "x")
+    assert_hashed(second, "y")
@@ -0,0 +1,47 @@
+def test_filtered_delete_removes_cascaded_children(client, seed):
+    from models import CommentModel, PostModel
+    from models.base_model import session
+
+    # comment 1 owns p1, p4 and p7, the filter joins on the posts it deletes
+    response = client.delete("/comments?postsTitle=p1")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"affectedRecords": 1}
+    assert session.query(CommentModel).filter_by(id=1).count() == 0
+    assert sorted(p.title for p in session.query(PostModel)) == ["p2", "p3", "p5", "p6"]
+    session.remove()
+
+
+def test_filtered_delete_without_matches(client, seed):
+    from models import PostModel
+    from models.base_model import session
+
+    response = client.delete("/comments?body=none")
+
+    assert response.get_json() == {"affectedRecords": 0}
+    assert session.query(PostModel).count() == 7
+    session.remove()
+
+
+def test_bulk_patch_rejects_nested_fields(client, seed):
+    response = client.patch(
+        "/comments",
+        json=[{"id": 1, "body": "a"}, {"id": 2, "posts": [{"title": "t"}]}],
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["errors"] == {
+        "1": {"posts": ["Nested fields cannot be updated in bulk."]}
+    }
+    assert client.get("/comments?id=1").get_json()["comments"][0]["body"] == "c1"
+
+
+def test_filtered_patch_rejects_nested_fields(client, seed):
+    response = client.patch(
+        "/comments?body=c1", json={"body": "a", "posts": [{"title": "t"}]}
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["errors"] == {
+        "posts": ["Nested fields cannot be updated in bulk."]
+    }
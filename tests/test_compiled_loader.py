@@ -0,0 +1,240 @@
+"""Parity of the compiled loaders of schemas/base_schema.py with Schema.load.
+
+Input the compiled loaders do not accept goes back to Schema.load through
+Fallback, so loaded data and validation errors must match marshmallow's.
+"""
+
+import json
+import random
+from types import SimpleNamespace as Obj
+
+import pytest
+from flask import Flask
+from marshmallow import EXCLUDE, ValidationError, fields, post_load, validate
+
+
+@pytest.fixture(scope="module")
+def schemas(app):
+    from schemas.base_schema import BaseSchema
+
+    class Child(BaseSchema):
+        flag = fields.Bool()
+        score = fields.Float(allow_nan=False)
+        loose = fields.Float()
+        n = fields.Int(strict=True)
+        raw = fields.Raw()
+        when = fields.DateTime()
+        code = fields.Str(validate=[validate.Length(min=2, max=4)])
+        eq = fields.Str(validate=validate.Length(equal=3))
+        kind = fields.Str(validate=validate.OneOf(["a", "b"]))
+
+    class Parent(BaseSchema):
+        some_name = fields.Str(required=True, allow_none=False)
+        renamed = fields.Int(attribute="real_attr")
+        dflt = fields.Str(load_default="dv")
+        dflt_call = fields.Int(load_default=lambda: 7)
+        ro = fields.Str(dump_only=True)
+        maybe = fields.Str(allow_none=True)
+        child = fields.Nested(Child)
+        kids = fields.Nested(Child, many=True, validate=validate.Length(max=2))
+        opt_child = fields.Nested(Child, allow_none=True)
+
+    class Hooked(BaseSchema):
+        a = fields.Int()
+
+        @post_load
+        def keep(self, data, **kwargs):
+            return data
+
+    class Excluding(BaseSchema):
+        class Meta:
+            unknown = EXCLUDE
+
+        a = fields.Int()
+
+    return Obj(Child=Child, Parent=Parent, Hooked=Hooked, Excluding=Excluding)
+
+
+def outcome(load, data):
+    """loaded data or validation errors, serialized to compare them exactly"""
+    try:
+        return "ok", json.dumps(load(data), sort_keys=True, default=repr)
+    except ValidationError as err:
+        return "error", json.dumps(err.messages, sort_keys=True, default=repr)
+    except Exception as err:
+        # to_snakecase expects an object, validator answers the others with 500
+        return "exception", type(err).__name__
+
+
+def assert_parity(schema, data, method="POST"):
+    from schemas.base_schema import compile_loader
+
+    load = compile_loader(schema)
+    assert load is not None
+
+    with Flask(__name__).test_request_context(method=method):
+        assert outcome(load, data) == outcome(schema.load, data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # booleans given as integers and strings
+        {"flag": 1},
+        {"flag": 0},
+        {"flag": 2},
+        {"flag": "yes"},
+        {"flag": "maybe"},
+        {"flag": []},
+        # strict integers
+        {"n": 5},
+        {"n": "5"},
+        {"n": 5.0},
+        {"n": True},
+        {"n": 2**70},
+        # floats refusing NaN and infinity
+        {"score": float("nan")},
+        {"score": float("inf")},
+        {"score": "nan"},
+        {"loose": float("nan")},
+        {"score": "1.5"},
+        {"score": False},
+        # validators
+        {"code": "a"},
+        {"code": "abcde"},
+        {"eq": "abcd"},
+        {"kind": "c"},
+        {"when": "not a date"},
+        {"when": "2024-01-02T03:04:05"},
+        # unknown keys
+        {"bogus": 1},
+        {"Flag": True},
+        {"flag": True, "when_x": 1},
+        # not an object
+        [],
+        "text",
+    ],
+    ids=repr,
+)
+def test_child_parity(schemas, data):
+    assert_parity(schemas.Child(), data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # required fields
+        {},
+        {"someName": None},
+        {"someName": ""},
+        {"some_name": "snake case key"},
+        {"SomeName": "x"},
+        {"some-name": "x"},
+        # defaults, dump_only and attribute
+        {"someName": "x", "ro": "read only"},
+        {"someName": "x", "renamed": "12"},
+        {"someName": "x", "maybe": None},
+        # nested one and many
+        {"someName": "x", "child": {"n": "1"}},
+        {"someName": "x", "child": None},
+        {"someName": "x", "optChild": None},
+        {"someName": "x", "child": "text"},
+        {"someName": "x", "kids": [{"flag": 1}, {"score": "nan"}]},
+        {"someName": "x", "kids": [{}, {}, {}]},
+        {"someName": "x", "kids": {}},
+        {"someName": "x", "kids": [1]},
+    ],
+    ids=repr,
+)
+@pytest.mark.parametrize("partial", [False, True])
+@pytest.mark.parametrize("method", ["POST", "PATCH"])
+def test_parent_parity(schemas, data, partial, method):
+    assert_parity(schemas.Parent(partial=partial), data, method)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        [{"someName": "x"}, {"someName": None}],
+        [{"someName": "x", "child": {"flag": 2}}],
+        {"someName": "x"},
+    ],
+    ids=repr,
+)
+def test_many_parity(schemas, data):
+    assert_parity(schemas.Parent(many=True), data)
+
+
+def test_random_bodies_parity(schemas):
+    values = [
+        None, True, False, 0, 1, -5, 2**70, 1.5, float("nan"), float("inf"), "",
+        "a", "ab", "abc", "abcde", "12", "1.5", "true", "no", [], [1], {},
+        "2024-01-02T03:04:05", b"\xff",
+    ]  # fmt: skip
+    child_keys = ["flag", "score", "loose", "n", "raw", "when", "code", "eq", "kind"]
+    parent_keys = ["someName", "some_name", "renamed", "dflt", "ro", "maybe"]
+
+    def child():
+        keys = child_keys + ["bogus"]
+        return {random.choice(keys): random.choice(values) for _ in range(3)}
+
+    def parent():
+        data = {
+            random.choice(parent_keys): random.choice(values)
+            for _ in range(random.randint(0, 4))
+        }
+        data.update(
+            random.choice(
+                [{}, {"child": child()}, {"kids": [child(), child()]}, {"child": None}]
+            )
+        )
+        return data
+
+    random.seed(7)
+
+    for schema in (schemas.Parent(), schemas.Parent(partial=True)):
+        for _ in range(500):
+            assert_parity(schema, parent())
+
+
+def test_unsupported_schemas_are_not_compiled(schemas):
+    from schemas.base_schema import compile_loader, get_loader
+
+    for schema in (
+        schemas.Hooked(),
+        schemas.Excluding(),
+        schemas.Parent(partial=("child",)),
+    ):
+        assert compile_loader(schema) is None
+        assert get_loader(schema) == schema.load
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"body": "ok"},
+        {"body": 5},
+        {"body": None},
+        {},
+        {"nope": 1},
+        {"body": "x", "posts": [{"title": 5}]},
+        {"body": "x", "posts": {"title": "t"}},
+        [{"body": "a"}, {"body": 1}, {"nope": True}],
+        [],
+    ],
+    ids=repr,
+)
+def test_endpoint_error_payloads_are_identical(client, monkeypatch, body):
+    import utils.helper
+
+    monkeypatch.setattr(utils.helper, "COMPILED_LOADER", True)
+    compiled = client.post("/comments", json=body)
+
+    monkeypatch.setattr(utils.helper, "COMPILED_LOADER", False)
+    loaded = client.post("/comments", json=body)
+
+    assert compiled.status_code == loaded.status_code
+
+    if compiled.status_code == 400:
+        assert compiled.data == loaded.data
@@ -0,0 +1,189 @@
+"""Parity of the compiled serializers of schemas/base_schema.py with Schema.dump."""
+
+import datetime
+import decimal
+from types import SimpleNamespace as Obj
+
+import pytest
+from flask import Flask
+from marshmallow import fields, post_dump
+
+
+@pytest.fixture(scope="module")
+def schemas(app):
+    from schemas.base_schema import BaseSchema
+
+    class Child(BaseSchema):
+        flag = fields.Bool()
+        score = fields.Float()
+        raw = fields.Raw()
+        when = fields.DateTime(format="%Y/%m/%d")
+        ts = fields.DateTime(format="timestamp")
+
+    class Parent(BaseSchema):
+        some_name = fields.Str(data_key="other_key")
+        renamed = fields.Int(attribute="real_attr")
+        dflt = fields.Str(dump_default="dv")
+        dflt_call = fields.Int(dump_default=lambda: 7)
+        child = fields.Nested(Child)
+        kids = fields.Nested(Child, many=True, only=("flag", "score"))
+        maybe = fields.Nested(Child, allow_none=True)
+        created_at = fields.DateTime()
+
+    class Hooked(BaseSchema):
+        a = fields.Int()
+
+        @post_dump
+        def extra(self, data, **kwargs):
+            return data
+
+    class Custom(BaseSchema):
+        m = fields.Method("get_m")
+
+        def get_m(self, obj):
+            return 1
+
+    class Dotted(BaseSchema):
+        a = fields.Int(attribute="inner.a")
+
+    class NestedHooked(BaseSchema):
+        h = fields.Nested(Hooked)
+
+    return Obj(
+        Parent=Parent,
+        Hooked=Hooked,
+        Custom=Custom,
+        Dotted=Dotted,
+        NestedHooked=NestedHooked,
+    )
+
+
+CHILD = Obj(
+    flag="false",
+    score=decimal.Decimal("1.25"),
+    raw={"x": [1]},
+    when=datetime.datetime(2024, 5, 6, 7, 8, 9),
+    ts=datetime.datetime(2024, 5, 6, 7, 8, 9),
+)
+
+OBJECTS = [
+    # nested one and many, data_key, attribute, bytes and numeric strings
+    Obj(
+        some_name=b"bytes",
+        real_attr="12",
+        child=CHILD,
+        kids=[CHILD, Obj(flag=1, score=3, raw=None, when=None, ts=None)],
+        maybe=None,
+        created_at=datetime.datetime(2024, 1, 1, 1, 1, 1, 123456),
+    ),
+    # nulls everywhere, empty nested many
+    Obj(
+        some_name=None,
+        real_attr=None,
+        child=None,
+        kids=[],
+        maybe=CHILD,
+        created_at=None,
+    ),
+    # missing attributes: child and the dump_default fields
+    Obj(
+        some_name="s",
+        real_attr=3.9,
+        kids=None,
+        maybe=None,
+        created_at=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    ),
+]
+
+VARIANTS = [
+    {},
+    {"only": ("kids", "some_name")},
+    {"exclude": ("child",)},
+]
+
+
+@pytest.mark.parametrize("method", ["GET", "POST", "PATCH"])
+@pytest.mark.parametrize("options", VARIANTS)
+@pytest.mark.parametrize("index", range(len(OBJECTS)))
+def test_single_object_parity(schemas, method, options, index):
+    from schemas.base_schema import compile_schema
+
+    schema = schemas.Parent(**options)
+
+    # PATCH drops the null values in to_camelcase
+    with Flask(__name__).test_request_context(method=method):
+        expected = schema.dump(OBJECTS[index])
+        dumped = compile_schema(schema)(OBJECTS[index])
+
+    assert dumped == expected
+    assert list(dumped) == list(expected)
+
+
+@pytest.mark.parametrize("method", ["GET", "PATCH"])
+def test_many_parity(schemas, method):
+    from schemas.base_schema import compile_schema
+
+    schema = schemas.Parent(many=True)
+
+    with Flask(__name__).test_request_context(method=method):
+        assert compile_schema(schema)(OBJECTS) == schema.dump(OBJECTS)
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+def test_envelope_parity(schemas, cursor):
+    from models.base_model import Paginate
+    from schemas.base_schema import compile_schema
+    from utils.helper import create_response_schema
+
+    schema = create_response_schema(schemas.Parent, only=("kids",), cursor=cursor)()
+    page = Paginate(1, 10, 2, OBJECTS[:2], "next", None)
+
+    with Flask(__name__).test_request_context():
+        assert compile_schema(schema)(page) == schema.dump(page)
+
+
+@pytest.mark.parametrize(
+    "name", ["Hooked", "Custom", "Dotted", "NestedHooked"], ids=str.lower
+)
+def test_unsupported_schemas_fall_back_to_dump(schemas, name):
+    from schemas.base_schema import compile_schema, get_serializer
+
+    schema = getattr(schemas, name)()
+
+    assert compile_schema(schema) is None
+    assert get_serializer(schema) == schema.dump
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/comments?perPage=3",
+        "/comments?perPage=3&fields=body,posts.title",
+        "/posts?perPage=5",
+        "/comments?page=-1",
+        "/comments?id=1",
+    ],
+)
+def test_endpoint_parity(client, seed, monkeypatch, url):
+    import models.base_model
+
+    monkeypatch.setattr(models.base_model, "COMPILED_SERIALIZER", True)
+    compiled = client.get(url).data
+
+    monkeypatch.setattr(models.base_model, "COMPILED_SERIALIZER", False)
+    assert client.get(url).data == compiled
+
+
+def test_patch_endpoint_parity(client, seed, monkeypatch):
+    import models.base_model
+
+    monkeypatch.setattr(models.base_model, "COMPILED_SERIALIZER", True)
+    compiled = client.patch("/comments", json={"id": 1, "body": "b"}).get_json()
+
+    monkeypatch.setattr(models.base_model, "COMPILED_SERIALIZER", False)
+    dumped = client.patch("/comments", json={"id": 1, "body": "b"}).get_json()
+
+    # each update moves updatedAt, the keys and the other values must match
+    assert list(dumped) == list(compiled)
+    assert dumped.pop("updatedAt") and compiled.pop("updatedAt")
+    assert dumped == compiled
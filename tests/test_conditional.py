@@ -0,0 +1,88 @@
+import pytest
+
+
+def test_list_is_validated_by_etag_only(client, seed):
+    response = client.get("/comments")
+
+    assert response.headers["ETag"].startswith('W/"')
+    assert "Last-Modified" not in response.headers
+
+    etag = response.headers["ETag"]
+    assert client.get("/comments", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_list_ignores_if_modified_since(client, seed):
+    response = client.get(
+        "/comments", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+
+    assert response.status_code == 200
+
+
+def test_list_delete_of_an_older_row_changes_the_etag(client, seed):
+    etag = client.get("/comments").headers["ETag"]
+
+    client.delete("/comments?body=c2")
+
+    response = client.get("/comments", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def freshness_queries(statements: list) -> list:
+    return [s for s in statements if "max(comment.updated_at)" in s]
+
+
+def test_etag_ignores_the_query_cache_versions(client, seed):
+    from models import CommentModel
+    from models.base_model import query_cache
+
+    etag = client.get("/comments").headers["ETag"]
+
+    # another worker would hold other versions of the same tables
+    query_cache.bump(CommentModel.__mapping__.cache_tables)
+
+    assert client.get("/comments").headers["ETag"] == etag
+
+
+def test_nested_changes_change_the_etag(client, seed):
+    from models import PostModel
+    from models.base_model import session
+
+    etag = client.get("/comments").headers["ETag"]
+
+    session.query(PostModel).filter_by(id=3).delete()
+    session.commit()
+    session.remove()
+
+    assert client.get("/comments").headers["ETag"] != etag
+
+
+@pytest.mark.parametrize(
+    "url, count", [("/comments?withCount=false", "exact"), ("/comments", "none")]
+)
+def test_reads_without_exact_count_skip_the_freshness_query(
+    client, seed, statements, monkeypatch, url, count
+):
+    from models import CommentModel
+
+    monkeypatch.setattr(CommentModel, "__count__", count)
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+
+    assert response.status_code == 200
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert freshness_queries(statements) == []
+
+
+def test_cached_reads_skip_the_freshness_query(client, seed, statements, monkeypatch):
+    from models import CommentModel
+
+    monkeypatch.setattr(CommentModel, "__cache__", True)
+
+    etag = client.get("/comments").headers["ETag"]
+    response = client.get("/comments", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert freshness_queries(statements) == []
@@ -0,0 +1,89 @@
+"""Keyset pagination of the posts on a DateTime sort key other than id."""
+
+import subprocess
+from datetime import datetime
+
+import pytest
+
+from generate import POST_PROMPTS, flaskforge
+
+
+@pytest.fixture
+def posts(client, monkeypatch):
+    from models import PostModel
+
+    monkeypatch.setattr(PostModel, "__cursor__", "created_at")
+
+    return client
+
+
+def walk(client, cursor_name: str, url: str) -> list:
+    """titles of the pages met following cursor_name from url"""
+    pages = []
+
+    while url is not None:
+        body = client.get(url).get_json()
+        pages.append([post["title"] for post in body["posts"]])
+
+        cursor = body.get(cursor_name)
+        url = f"/posts?perPage=3&cursor={cursor}" if cursor else None
+
+    return pages
+
+
+def test_pages_through_rows_of_the_same_second(posts, seed):
+    # func.now() stores the seconds only, the seven posts share created_at
+    pages = walk(posts, "nextCursor", "/posts?perPage=3")
+
+    assert pages == [["p1", "p2", "p3"], ["p4", "p5", "p6"], ["p7"]]
+
+
+def test_pages_back_and_forth_in_created_at_order(posts):
+    from models import PostModel
+    from models.base_model import session
+
+    posts.post("/comments", json={"body": "c1"})
+
+    # created_at runs against id, whole seconds and microseconds mixed
+    for i in range(7):
+        session.add(
+            PostModel(
+                {
+                    "title": f"p{i + 1}",
+                    "comment_id": 1,
+                    "created_at": datetime(2024, 1, 1, 0, 0, 10 - i, 500 * (i % 2)),
+                }
+            )
+        )
+    session.commit()
+    session.remove()
+
+    forward = posts.get("/posts?perPage=3").get_json()
+    assert [p["title"] for p in forward["posts"]] == ["p7", "p6", "p5"]
+
+    pages = walk(posts, "nextCursor", "/posts?perPage=3")
+    assert pages == [["p7", "p6", "p5"], ["p4", "p3", "p2"], ["p1"]]
+
+    last = posts.get(f"/posts?perPage=3&cursor={forward['nextCursor']}").get_json()
+    back = posts.get(f"/posts?perPage=3&cursor={last['prevCursor']}").get_json()
+    assert [p["title"] for p in back["posts"]] == ["p7", "p6", "p5"]
+
+
+def test_unknown_cursor_key_is_refused_before_writing(tmp_path):
+    flaskforge(str(tmp_path), "initapp", "proj")
+    path = tmp_path / "proj"
+
+    with pytest.raises(subprocess.CalledProcessError) as err:
+        flaskforge(
+            str(path),
+            "create",
+            "post",
+            "--force",
+            "--use-cursor",
+            "--cursor-key",
+            "bogus",
+            prompts=POST_PROMPTS,
+        )
+
+    assert "Cursor key bogus is not a column of post" in err.value.stderr
+    assert not (path / "models" / "post_model.py").exists()
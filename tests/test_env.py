@@ -0,0 +1,14 @@
+import os
+
+from dotenv import dotenv_values
+
+from generate import ROOT
+
+
+def test_env_example_is_valid_dotenv():
+    values = dotenv_values(os.path.join(ROOT, "flaskforge", "bases", "base_env.py"))
+
+    assert values["COMPRESSION_MIMETYPES"] == (
+        "application/json,application/x-ndjson,text/html,text/css,text/javascript"
+    )
+    assert not [name for name, value in values.items() if value in ("(", None)]
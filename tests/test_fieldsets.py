@@ -0,0 +1,27 @@
+def test_list_dotted_fieldset_dumps_only_requested_fields(client, seed):
+    response = client.get("/comments?perPage=5&fields=body,posts.title")
+
+    assert response.status_code == 200
+    comments = response.get_json()["comments"]
+    assert comments[0] == {
+        "body": "c1",
+        "posts": [{"title": "p1"}, {"title": "p4"}, {"title": "p7"}],
+    }
+    assert all(set(post) == {"title"} for c in comments for post in c["posts"])
+
+
+def test_list_dotted_fieldset_does_not_lazy_load(client, seed, statements):
+    client.get("/comments?perPage=5&fields=body,posts.title")
+
+    # freshness, page, count and the posts of the page, deferred columns stay unloaded
+    assert len(statements) == 4
+
+
+def test_single_dotted_fieldset(client, seed):
+    response = client.get("/comments?id=1&fields=body,posts.title")
+
+    assert response.status_code == 200
+    assert response.get_json()["comments"][0] == {
+        "body": "c1",
+        "posts": [{"title": "p1"}, {"title": "p4"}, {"title": "p7"}],
+    }
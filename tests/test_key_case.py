@@ -0,0 +1,160 @@
+"""Identity of the key translation tables of BaseSchema with stringcase.
+
+reference_snakecase and reference_camelcase are the per-call stringcase
+translations BaseSchema.to_snakecase and to_camelcase replaced.
+"""
+
+import random
+import string
+from types import SimpleNamespace as Obj
+
+import pytest
+from flask import Flask, request
+from marshmallow import fields
+from stringcase import camelcase, snakecase
+
+
+def reference_snakecase(schema, data):
+    local_data = {snakecase(k): v for k, v in data.items()}
+    if request.method == "GET" or schema.context.get("query"):
+        return {
+            f: (
+                (
+                    [
+                        {
+                            nf.replace(f"{f}_", ""): nv
+                            for nf, nv in local_data.items()
+                            if nf.startswith(f"{f}_")
+                        }
+                    ]
+                    if v.schema.many
+                    else {
+                        nf.replace(f"{f}_", ""): nv
+                        for nf, nv in local_data.items()
+                        if nf.startswith(f"{f}_")
+                    }
+                )
+                if isinstance(v, fields.Nested)
+                else local_data.get(f)
+            )
+            for f, v in schema.fields.items()
+            if local_data.get(f)
+            or (
+                isinstance(v, fields.Nested)
+                and any(nf.startswith(f"{f}_") for nf in local_data.keys())
+            )
+        }
+
+    return local_data
+
+
+def reference_camelcase(schema, data):
+    if request.method == "PATCH":
+        return {camelcase(k): v for k, v in data.items() if v is not None}
+
+    return {camelcase(k): v for k, v in data.items()}
+
+
+@pytest.fixture(scope="module")
+def schemas(app):
+    from schemas import CommentSchema, PostSchema
+    from schemas.base_schema import BaseSchema
+
+    class Tag(BaseSchema):
+        tag_name = fields.Str()
+        id = fields.Int()
+
+    class Post(BaseSchema):
+        title = fields.Str()
+        id = fields.Int()
+        post_tag = fields.Nested(Tag)
+
+    # post and post_tag both prefix the flattened key post_tag_tag_name
+    class Comment(BaseSchema):
+        id = fields.Int()
+        body = fields.Str(data_key="bodyText")
+        created_at = fields.DateTime()
+        posts = fields.Nested(Post, many=True)
+        post = fields.Nested(Post)
+        post_tag = fields.Nested(Tag, many=True)
+
+    return Obj(all=[Comment, Post, Tag, CommentSchema, PostSchema], Comment=Comment)
+
+
+WORDS = [
+    "id", "body", "title", "posts", "post", "tag", "name", "created", "at",
+    "page", "per", "x", "Tag", "Post", "posts_title", "post_tag", "_", "__",
+]  # fmt: skip
+
+VALUES = [0, "", None, 1, "a", [], {"k": 1}]
+
+
+def random_key() -> str:
+    key = "_".join(random.choice(WORDS) for _ in range(random.randint(1, 4)))
+    draw = random.random()
+
+    if draw < 0.3:
+        return key
+    if draw < 0.8:
+        return camelcase(key)
+    if draw < 0.9:
+        return key.upper()
+
+    return "".join(random.choice(string.ascii_letters + "_") for _ in range(5))
+
+
+def assert_identity(schema, data):
+    assert repr(schema.to_snakecase(dict(data))) == repr(
+        reference_snakecase(schema, dict(data))
+    )
+    assert repr(schema.to_camelcase(dict(data))) == repr(
+        reference_camelcase(schema, dict(data))
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # flattened nested query keys, through the prefixes table
+        {"postsTitle": "t", "postsId": "2", "id": "1", "bodyText": "x"},
+        {"postTagTagName": "n", "postTitle": "q", "postPostTagId": "3"},
+        {"post_tag_tag_name": "n", "posts_title_posts_x": "y"},
+        # falsy values are dropped from queries
+        {"id": 0, "bodyText": "", "postsTitle": None},
+        # keys outside the tables: pagination and unknown keys
+        {"page": "1", "perPage": "20", "withCount": "false", "bogus": 1},
+        {"POSTS_TITLE": "x", "Created_At": "y"},
+    ],
+    ids=repr,
+)
+@pytest.mark.parametrize("method", ["GET", "POST", "PATCH"])
+@pytest.mark.parametrize("query", [False, True])
+def test_key_tables_identity(schemas, data, method, query):
+    with Flask(__name__).test_request_context(method=method):
+        assert_identity(schemas.Comment(context={"query": query}), data)
+
+
+def test_random_keys_identity(schemas):
+    random.seed(1)
+
+    for method in ("GET", "POST", "PATCH"):
+        with Flask(__name__).test_request_context(method=method):
+            for schema_cls in schemas.all:
+                for context in ({}, {"query": True}):
+                    schema = schema_cls(context=context)
+
+                    for _ in range(300):
+                        data = {
+                            random_key(): random.choice(VALUES)
+                            for _ in range(random.randint(0, 8))
+                        }
+                        assert_identity(schema, data)
+
+
+def test_key_tables_leave_declared_fields_unresolved(schemas):
+    schemas.Comment.get_key_tables()
+
+    # a nested schema cached on a declared field would ignore dotted only
+    assert schemas.Comment._declared_fields["posts"]._schema is None
+    schema = schemas.Comment(only=("body", "posts.title"))
+    assert set(schema.fields["posts"].schema.fields) == {"title"}
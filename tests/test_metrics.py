@@ -0,0 +1,56 @@
+"""The /metrics/* endpoints are opt-in with METRICS and need authentication."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+NAMES = ("statements", "cache", "schemas", "pool")
+
+# the app registers the endpoints at import, a fresh process imports it with METRICS
+SCRIPT = """
+import json
+from flask_jwt_extended import create_access_token
+import runner
+
+client = runner.app.test_client()
+with runner.app.app_context():
+    headers = {"Authorization": f"Bearer {create_access_token(identity='ops')}"}
+
+print(json.dumps({
+    name: [
+        client.get(f"/metrics/{name}").status_code,
+        client.get(f"/metrics/{name}", headers=headers).status_code,
+    ]
+    for name in %r
+}))
+"""
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_metrics_are_not_registered_by_default(client, name):
+    assert client.get(f"/metrics/{name}").status_code == 404
+
+
+def test_metrics_require_authentication(project):
+    env = {
+        **os.environ,
+        "METRICS": "true",
+        "JWT_SECRET_KEY": "secret",
+        "JWT_TOKEN_LOCATION": "headers",
+    }
+
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT % (NAMES,)],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(result.stdout.splitlines()[-1]) == {
+        name: [401, 200] for name in NAMES
+    }
@@ -0,0 +1,94 @@
+"""Read-replica routing with two SQLite files standing in for the primary and
+the replica, the engines are built at import so the app runs in a fresh process.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+SCRIPT = """
+import json
+import os
+import sys
+
+from flask_jwt_extended import create_access_token
+from models.base_model import Base, engine, replicas
+from models import CommentModel
+import runner
+
+replica = replicas.engines[0]
+for engine_ in (engine, replica):
+    Base.metadata.create_all(engine_)
+
+# the same table holds different rows in each file, the bodies tell them apart
+with engine.begin() as connection:
+    connection.execute(CommentModel.__table__.insert(), {"body": "primary"})
+with replica.begin() as connection:
+    connection.execute(CommentModel.__table__.insert(), {"body": "replica"})
+
+with runner.app.app_context():
+    headers = {"Authorization": f"Bearer {create_access_token(identity='u')}"}
+
+
+def bodies(client):
+    response = client.get("/comments", headers=headers)
+    return [c["body"] for c in response.get_json()["comments"]]
+
+
+def stored(engine_):
+    with engine_.connect() as connection:
+        return sorted(
+            row.body for row in connection.execute(CommentModel.__table__.select())
+        )
+
+
+seen = {}
+client = runner.app.test_client()
+seen["read"] = bodies(client)
+
+client.post("/comments", json={"body": "written"}, headers=headers)
+seen["primary_rows"] = stored(engine)
+seen["replica_rows"] = stored(replica)
+seen["read_your_writes"] = bodies(client)
+seen["other_client"] = bodies(runner.app.test_client())
+
+# the replica file can no longer be opened, its health check fails
+replica.dispose()
+os.remove(sys.argv[1])
+os.mkdir(sys.argv[1])
+seen["replica_down"] = bodies(runner.app.test_client())
+
+print(json.dumps(seen))
+"""
+
+
+def test_reads_go_to_the_replica_and_writes_to_the_primary(project, tmp_path):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{primary}",
+        "DATABASE_REPLICA_URLS": f"sqlite:///{replica}",
+        # check the replica before every read
+        "REPLICA_HEALTH_INTERVAL": "0",
+        "JWT_SECRET_KEY": "secret",
+        "JWT_TOKEN_LOCATION": "headers",
+    }
+
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT, str(replica)],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    seen = json.loads(result.stdout.splitlines()[-1])
+
+    assert seen["read"] == ["replica"]
+    assert seen["primary_rows"] == ["primary", "written"]
+    assert seen["replica_rows"] == ["replica"]
+    # the cookie set by the write keeps the client on the primary
+    assert seen["read_your_writes"] == ["primary", "written"]
+    assert seen["other_client"] == ["replica"]
+    assert seen["replica_down"] == ["primary", "written"]
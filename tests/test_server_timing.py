@@ -0,0 +1,51 @@
+"""Server-Timing of a write with SERVER_TIMING, read by the app at import."""
+
+import json
+import os
+import subprocess
+import sys
+
+SCRIPT = """
+import json
+from flask_jwt_extended import create_access_token
+import runner
+from models.base_model import Base, engine
+
+Base.metadata.create_all(engine)
+
+client = runner.app.test_client()
+with runner.app.app_context():
+    headers = {"Authorization": f"Bearer {create_access_token(identity='ops')}"}
+
+response = client.post("/comments", json={"body": "timed"}, headers=headers)
+client.delete(f"/comments?id={response.get_json()['id']}", headers=headers)
+
+print(json.dumps(response.headers["Server-Timing"]))
+"""
+
+
+def test_write_times_its_flush_and_commit_apart(app, project):
+    env = {
+        **os.environ,
+        "SERVER_TIMING": "true",
+        "JWT_SECRET_KEY": "secret",
+        "JWT_TOKEN_LOCATION": "headers",
+    }
+
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    metrics = {
+        metric.split(";")[0]: metric
+        for metric in json.loads(result.stdout.splitlines()[-1]).split(", ")
+    }
+
+    # commit_ only flushes inside a request, dispatch_request commits once
+    assert 'desc="1 calls"' in metrics["flush"]
+    assert 'desc="1 calls"' in metrics["commit"]
+    assert {"validate", "db", "jsonify", "total"} <= set(metrics)